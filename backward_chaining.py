@@ -1,121 +1,327 @@
-from utils import is_tautology
+from knowledge_base import KnowledgeBase, compile_kb
+from result_cache import ResultCache, QueryCache, PATH_DEPENDENT
+from utils import negate_literal
+from tracing import tracer, INFO, DEBUG
+from model_check import clause_masks, literal_bit
+from goal_selection import first_goal, selection_strategy
+from instrumentation import counters
 
-def verify_solution(kb, assignment):
+def verify_solution(kb, assignment, assumptions=()):
     """
-    Verifies whether the given assignment satisfies all clauses in the KB.
+    Verifies that the given (partial) assignment does not falsify any clause in the KB.
+    A clause is falsified only when the complement of every one of its literals is true;
+    literals the proof never touched are left open rather than counted as false.
+    Assumption literals are checked as if they were unit clauses of the KB.
+    For a compiled KnowledgeBase the assignment and assumptions are encoded literals,
+    and the check runs on the KB's clause bitsets (see model_check.ClauseMasks).
     """
+    if isinstance(kb, KnowledgeBase):
+        masks = clause_masks(kb)
+        falsified = masks.falsified_mask(assignment)
+        for assumption in assumptions:
+            if falsified >> literal_bit(assumption) & 1:
+                return False
+        return masks.falsified_clause(falsified) is None
+
+    for assumption in assumptions:
+        if assignment.get(negate_literal(assumption)):
+            return False
     for clause in kb:
         clause_satisfied = False
         for literal in clause:
-            if literal in assignment and assignment[literal]:
+            if not assignment.get(negate_literal(literal)):
                 clause_satisfied = True
                 break
         if not clause_satisfied:
-            return False  # If any clause is not satisfied, return False
+            return False  # If any clause is falsified, return False
     return True
 
 
-def solve(kb, query, visited=None, assignment=None):
+def _has_contradiction(goals):
     """
-    SLD resolution using backward chaining with contradiction detection and solution verification.
+    Detects complementary pairs in a set of encoded goals.
+    Goals are a conjunction, so a set containing both x and -x can never be proved.
     """
-    if visited is None:
-        visited = set()
-    if assignment is None:
-        assignment = {}
+    for lit in goals:
+        if -lit in goals:
+            return True
+    return False
 
-    # Remove contradictions
-    query = is_tautology(query)
-    
-    if not query:
-        print(f"Solution verified! Truth assignments: {assignment}")
-        return True  # If contradiction removed all, assume success.
 
-    query_key = tuple(sorted(query))
-    if query_key in visited:
-        print(f"Cycle detected for query: {query}")
-        return False  # Prevent infinite loops.
+def _import_assignment(kb, assignment):
+    """
+    Encodes the caller's initial truth assignments. Symbols the KB does not know
+    cannot affect any clause, so they are skipped.
+    """
+    encoded_assignment = {}
+    if assignment:
+        for literal, value in assignment.items():
+            encoded = kb.symbols.lookup(literal)
+            if encoded is not None:
+                encoded_assignment[encoded] = value
+    return encoded_assignment
 
-    visited.add(query_key)  # Mark query as visited.
 
-    q = query[0]  # Take the first goal
-    rest_query = query[1:]  # Remaining goals
+def _encode_query(kb, query, assumptions=()):
+    """
+    Encodes a query and its assumptions without adding symbols to the KB's symbol table.
+    A goal on a symbol the KB does not contain holds only if it is itself assumed,
+    and is dropped then; otherwise it cannot be proved and None is returned, so the
+    query fails without searching. Assumptions on unknown symbols cannot take part in
+    any resolution step and are dropped as well.
+    Returns (goals, assumptions) as encoded literals, or None.
+    """
+    goals = []
+    for literal in query:
+        encoded = kb.symbols.lookup(literal)
+        if encoded is not None:
+            goals.append(encoded)
+        elif literal not in assumptions:
+            return None
 
-    for clause in kb:
-        if q in clause:
-            new_query = list(set([
-                (lit.replace('¬', '') if '¬' in lit else '¬' + lit) for lit in clause if lit != q
-            ] + rest_query))
+    encoded_assumptions = (kb.symbols.lookup(literal) for literal in assumptions)
+    return goals, frozenset(literal for literal in encoded_assumptions if literal is not None)
 
-            new_query = is_tautology(new_query)  # Clean new query
 
-            print(f"New query: {new_query}")
+def _trace_step(kb, goal, clause_id, depth, proved, verified):
+    """
+    Records the resolution of goal against a clause and its outcome: 'proved', 'failed',
+    or 'rejected' when verify_solution refused the proof.
+    """
+    outcome = 'proved' if verified else 'rejected' if proved else 'failed'
+    tracer.emit('resolve', goal=kb.symbols.decode(goal), clause=kb.symbols.decode_clause(kb.clause(clause_id)),
+                depth=depth, outcome=outcome)
 
-            # Mark q as true in assignment
-            assignment[q] = True
 
-            if solve(kb, new_query, visited, assignment):
-                # After solving, verify if the assignment satisfies KB
-                if verify_solution(kb, assignment):
-                    print(f"Solution verified! Truth assignments: {assignment}")
-                    return True
+def _export_assignment(kb, encoded_assignment, assignment):
+    """
+    Copies the truth assignments found by a solver back into the caller's dict, decoded.
+    """
+    if assignment is not None:
+        decode = kb.symbols.decode
+        for literal, value in encoded_assignment.items():
+            assignment[decode(literal)] = value
 
-    return False
 
+def solve(kb, query, visited=None, assignment=None, assumptions=(), select=None):
+    """
+    SLD resolution using backward chaining with contradiction detection and solution verification.
 
-def solve_opt(kb, query, cache=None, visited=None, assignment=None):
+    kb may be a plain list of clauses, which is compiled into a KnowledgeBase on every
+    call, or a KnowledgeBase compiled once and reused across queries.
+    assignment, if given, holds initial truth values and receives the ones found.
+    assumptions are per-query facts that hold as if they were unit clauses of the KB,
+    so one compiled base KB serves every query without being copied or modified.
+    select picks the goal each step resolves: a name such as 'fail_first' or a strategy
+    from goal_selection (see selection_strategy); by default the smallest encoded literal.
+    """
+    kb = compile_kb(kb)
+    if visited is None:
+        visited = set()
+
+    encoded = _encode_query(kb, query, assumptions)
+    if encoded is None:
+        return False
+    goals, assumptions = encoded
+
+    encoded_assignment = _import_assignment(kb, assignment)
+    result = _search(kb, goals, None, visited, False, encoded_assignment, assumptions,
+                     selection_strategy(select))
+    _export_assignment(kb, encoded_assignment, assignment)
+    return result
+
+
+def solve_opt(kb, query, cache=None, visited=None, assignment=None, assumptions=(), select=None):
     """
     Optimized SLD resolution using backward chaining with caching, cycle detection, and solution verification.
+
+    kb, assignment, assumptions and select are treated as in solve(). Cached results depend
+    on the assumptions, so a cache passed in must not be shared across assumption sets.
+    Without a cache, visited set or initial assignment, sub-goal results are kept in
+    the KB's ResultCache (see result_cache_of) and reused by later queries.
+
+    visited holds the goal sets on the current path only. A failure is cached only if
+    no goal set below it was cut off as a cycle and no proof below it was rejected by
+    verify_solution: cache[PATH_DEPENDENT] counts those events, and such a failure may
+    only hold for the path and assignment that led to it.
     """
-    if cache is None:
+    kb = compile_kb(kb)
+    encoded = _encode_query(kb, query, assumptions)
+    if encoded is None:
+        return False
+    goals, assumptions = encoded
+
+    shared = cache is None and visited is None and not assignment
+    if shared:
+        cache = QueryCache(result_cache_of(kb), assumptions)
+    elif cache is None:
         cache = {}
     if visited is None:
         visited = set()
-    if assignment is None:
-        assignment = {}
 
-    # Convert query to a canonical tuple representation
-    query_key = tuple(sorted(query))
+    encoded_assignment = _import_assignment(kb, assignment)
+    result = _search(kb, goals, cache, visited, True, encoded_assignment, assumptions,
+                     selection_strategy(select))
+    _export_assignment(kb, encoded_assignment, assignment)
+    if shared:
+        cache.commit()
+    return result
 
-    if query_key in cache:
-        return cache[query_key]  # Use cached result
 
-    if query_key in visited:
-        print(f"Cycle detected for query: {query}")
-        return False  # Prevent infinite loops
+def result_cache_of(kb):
+    """
+    Return the ResultCache solve_opt() keeps for a compiled KB; its stats() report
+    hits and misses across queries. It is discarded when a clause is added.
+    """
+    return kb.engine('results', lambda kb: ResultCache())
 
-    visited.add(query_key)  # Mark query as visited
 
-    # Remove contradictions
-    query = is_tautology(query)
+_UNSET = object()  # trail marker for a literal the assignment did not contain
 
-    if not query:
-        cache[query_key] = True
-        print(f"Solution verified! Truth assignments: {assignment}")
-        return True  # If contradiction removed all, assume success.
 
-    q = query[0]
-    rest_query = query[1:]
+class _Frame:
+    """A goal set being proved: its first goal, and the alternatives tried for it so far."""
+    __slots__ = ('key', 'goal', 'rest', 'clause_ids', 'next', 'trail_mark', 'path_dependent')
+
+    def __init__(self, key, goal, rest, clause_ids, next, trail_mark, path_dependent):
+        self.key = key
+        self.goal = goal
+        self.rest = rest
+        self.clause_ids = clause_ids
+        self.next = next  # -1 for the assumption of goal, else the index of the next clause
+        self.trail_mark = trail_mark
+        self.path_dependent = path_dependent
 
-    for clause in kb:
-        if q in clause:
-            new_query = list(set([
-                (lit.replace('¬', '') if '¬' in lit else '¬' + lit) for lit in clause if lit != q
-            ] + rest_query))
 
-            new_query = is_tautology(new_query)
+def _search(kb, goals, cache, visited, path_only, assignment, assumptions, select=first_goal):
+    """
+    Depth-first SLD resolution over encoded goals with an explicit stack of frames,
+    shared by solve() (cache=None, visited kept for the whole search) and solve_opt()
+    (a cache, visited holding the current path only).
 
-            print(f"Resolving {q} using clause {clause} gives new query: {new_query}")
+    Setting a goal true is recorded on a trail, and a goal set that fails, or a proof
+    rejected by verify_solution, undoes the assignment back to where it started, so
+    backtracking never copies the assignment and only proofs in progress are verified.
+    select is the goal-selection strategy, called only for goal sets of two or more goals.
+    The search is counted in locals and added to the shared counters once, when enabled.
+    """
+    literals, offsets = kb.literals, kb.offsets
+    symbols = kb.symbols
+    trail = []
+    stack = []
+    pending = goals  # goal set to enter next, or None when a result goes back to the top frame
+    result = None
+    steps = scanned = lookups = hits = cutoffs = verifies = max_depth = 0
 
-            # Mark q as true in assignment
-            assignment[q] = True
+    while True:
+        if pending is not None:
+            query = set(pending)
+            pending = None
+            query_key = tuple(sorted(query))
+            depth = len(stack)
+            if depth > max_depth:
+                max_depth = depth
+            lookups += cache is not None
 
-            if solve_opt(kb, new_query, cache, visited, assignment):
-                # After solving, verify if the assignment satisfies KB
-                if verify_solution(kb, assignment):
+            if cache is not None and query_key in cache:
+                hits += 1
+                result = cache[query_key]  # Use cached result
+            elif query_key in visited:
+                cutoffs += 1
+                if tracer.level >= INFO:
+                    tracer.emit('cycle', goals=symbols.decode_clause(query_key), depth=depth)
+                if cache is not None:
+                    _mark_path_dependent(cache)
+                result = False  # Prevent infinite loops
+            elif _has_contradiction(query):
+                if cache is not None:
+                    cache[query_key] = False
+                result = False  # A contradictory goal set fails this branch
+            elif not query:
+                if cache is not None:
                     cache[query_key] = True
-                    print(f"Solution verified! Truth assignments: {assignment}")
-                    return True
+                if tracer.level >= INFO:
+                    tracer.emit('proved', depth=depth, assignment=symbols.decode_assignment(assignment))
+                result = True  # All goals proved
+            else:
+                visited.add(query_key)
+                if select is first_goal or len(query_key) == 1:
+                    goal, rest = query_key[0], query_key[1:]
+                else:
+                    goal = select(kb, query_key, assumptions)
+                    rest = tuple(literal for literal in query_key if literal != goal)
+                clause_ids = kb.clause_ids(goal)
+                scanned += len(clause_ids)
+                stack.append(_Frame(query_key, goal, rest, clause_ids,
+                                    -1 if goal in assumptions else 0, len(trail),
+                                    cache.get(PATH_DEPENDENT, 0) if cache is not None else 0))
+                result = None
+
+        if not stack:
+            if counters.enabled:
+                counters.add(resolution_steps=steps, clauses_scanned=scanned, cache_hits=hits, cache_misses=lookups - hits,
+                             cycle_cutoffs=cutoffs, verify_calls=verifies)
+                counters.record_max('max_depth', max_depth)
+            return result
+
+        frame = stack[-1]
+        if result is not None:
+            # A resolvent of frame.goal came back
+            verified = False
+            if result:
+                verifies += 1
+                verified = verify_solution(kb, assignment, assumptions)
+            if tracer.level >= DEBUG and frame.next > 0:
+                _trace_step(kb, frame.goal, frame.clause_ids[frame.next - 1], len(stack) - 1, result, verified)
+            if verified:
+                stack.pop()
+                _finish(frame, True, cache, visited, path_only)
+                result = True
+                continue
+            if result and cache is not None:
+                _mark_path_dependent(cache)  # The proof was rejected for this assignment
+            _undo(assignment, trail, frame.trail_mark)
+
+        goal = frame.goal
+        if frame.next < len(frame.clause_ids):
+            # Mark the goal as true and resolve it with the next assumption or clause
+            if assignment.get(goal, _UNSET) is not True:
+                trail.append((goal, assignment.get(goal, _UNSET)))
+                assignment[goal] = True
+            if frame.next < 0:
+                pending = frame.rest  # An assumed goal is resolved against its unit clause
+            else:
+                clause_id = frame.clause_ids[frame.next]
+                pending = [-literals[i] for i in range(offsets[clause_id], offsets[clause_id + 1])
+                           if literals[i] != goal]
+                pending.extend(frame.rest)
+            frame.next += 1
+            steps += 1
+            result = None
+        else:
+            stack.pop()
+            _undo(assignment, trail, frame.trail_mark)
+            _finish(frame, False, cache, visited, path_only)
+            result = False
+
+
+def _undo(assignment, trail, mark):
+    """Restore the assignment to what it was when the trail had mark entries."""
+    while len(trail) > mark:
+        literal, value = trail.pop()
+        if value is _UNSET:
+            del assignment[literal]
+        else:
+            assignment[literal] = value
+
+
+def _finish(frame, proved, cache, visited, path_only):
+    """Leave the goal set of a frame: take it off the path and cache its result if it is exact."""
+    if path_only:
+        visited.discard(frame.key)
+    if cache is not None and (proved or cache.get(PATH_DEPENDENT, 0) == frame.path_dependent):
+        cache[frame.key] = proved
+
 
-    cache[query_key] = False
-    return False
\ No newline at end of file
+def _mark_path_dependent(cache):
+    cache[PATH_DEPENDENT] = cache.get(PATH_DEPENDENT, 0) + 1
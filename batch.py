@@ -0,0 +1,36 @@
+import os
+from multiprocessing import Pool
+from knowledge_base import compile_kb
+from backward_chaining import solve_opt
+
+# State of a worker process, set once by _init_worker
+_worker_kb = None
+_worker_solver = None
+
+
+def _init_worker(kb, solver):
+    global _worker_kb, _worker_solver
+    _worker_kb = kb
+    _worker_solver = solver
+
+
+def _solve_case(case):
+    facts, goal = case
+    return _worker_solver(_worker_kb, [goal], assumptions=facts)
+
+
+def solve_batch(kb, cases, solver=solve_opt, processes=None, chunksize=16):
+    """
+    Answer a batch of (facts, goal) pairs against one KB across a pool of worker processes.
+
+    The KB is compiled once and sent to each worker when the pool starts, not with every
+    task; each case then only ships its facts and goal, which the solver receives as
+    assumptions. Results are yielded as they arrive, in the order of the cases.
+    solver must be a module-level function taking (kb, query, assumptions=...).
+    processes defaults to the number of CPUs.
+    """
+    kb = compile_kb(kb)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    with Pool(processes, initializer=_init_worker, initargs=(kb, solver)) as pool:
+        yield from pool.imap(_solve_case, cases, chunksize)
@@ -0,0 +1,133 @@
+import argparse, json, os, random, sys, timeit
+
+from tokenizer import tokenize, parse_formula
+from convert_to_cnf import (eliminate_implications, push_negation_inward, distribute_or_over_and,
+                            node_to_list_of_lists, convert_to_cnf_list)
+from knowledge_base import KnowledgeBase
+from backward_chaining import solve, solve_opt
+from sat_solver import solve_sat
+from forward_chaining import solve_forward
+from tabling import solve_tabled
+
+BASELINE_PATH = "output/benchmark_baseline.json"
+DEFAULT_SIZES = (10, 50, 200)
+DEFAULT_THRESHOLD = 1.5  # fail when a benchmark gets this many times slower than its baseline
+REPEAT = 3
+
+
+def random_formula(size, rng):
+    """
+    A formula with size clauses of the shape (S.. and S..) implies L.., joined by 'and',
+    like a conjunction of rule-file lines.
+    """
+    rules = []
+    for i in range(size):
+        premises = " and ".join(f"S{rng.randrange(size):03d}" for _ in range(rng.randint(1, 3)))
+        rules.append(f"(({premises}) implies L{i:03d})")
+    return " and ".join(rules)
+
+
+def rule_chain(size):
+    """
+    A Horn KB where S000 derives L000 and each L.. derives the next one, so proving the
+    last conclusion takes size resolution steps.
+    """
+    kb = [['¬S000', 'L000']]
+    for i in range(1, size):
+        kb.append([f'¬L{i - 1:03d}', f'L{i:03d}'])
+    return kb
+
+
+def benchmarks(size):
+    """
+    Return the benchmarks for one workload size as (name, zero-argument callable) pairs.
+    """
+    rng = random.Random(size)
+    formula = random_formula(size, rng)
+    tree = parse_formula(formula)
+    implication_free = eliminate_implications(tree)
+    negation_normal = push_negation_inward(implication_free)
+    cnf = distribute_or_over_and(negation_normal)
+
+    chain = rule_chain(size)
+    kb = KnowledgeBase(chain)
+    goal = [f'L{size - 1:03d}']
+
+    return [
+        ("tokenize", lambda: tokenize(formula)),
+        ("parse_formula", lambda: parse_formula(formula)),
+        ("eliminate_implications", lambda: eliminate_implications(tree)),
+        ("push_negation_inward", lambda: push_negation_inward(implication_free)),
+        ("distribute_or_over_and", lambda: distribute_or_over_and(negation_normal)),
+        ("node_to_list_of_lists", lambda: node_to_list_of_lists(cnf)),
+        ("convert_to_cnf_list", lambda: convert_to_cnf_list(formula)),
+        ("tseitin", lambda: convert_to_cnf_list(formula, mode='equisatisfiable')),
+        ("compile_kb", lambda: KnowledgeBase(chain)),
+        ("solve", lambda: solve(kb, goal, assumptions=['S000'])),
+        ("solve_opt", lambda: solve_opt(kb, goal, cache={}, assumptions=['S000'])),
+        ("solve_sat", lambda: solve_sat(KnowledgeBase(chain), goal, assumptions=['S000'])),
+        ("solve_forward", lambda: solve_forward(KnowledgeBase(chain), goal, assumptions=['S000'])),
+        ("solve_tabled", lambda: solve_tabled(KnowledgeBase(chain), goal, assumptions=['S000'])),
+    ]
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=REPEAT):
+    """
+    Time every benchmark at every size. Returns {"name[size]": best time in seconds}.
+    Each timing is the fastest of repeat runs, which is the least noisy estimate.
+    """
+    results = {}
+    for size in sizes:
+        for name, function in benchmarks(size):
+            timer = timeit.Timer(function)
+            number, _ = timer.autorange()
+            results[f"{name}[{size}]"] = min(timer.repeat(repeat, number)) / number
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Return the benchmarks that got more than threshold times slower than the baseline,
+    as (name, baseline seconds, current seconds). Benchmarks missing from either side are skipped.
+    """
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference and seconds > reference * threshold:
+            regressions.append((name, reference, seconds))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the parser, CNF conversion and solvers.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes)
+    for name, seconds in results.items():
+        print(f"{name:32} {seconds * 1e6:12.1f} µs")
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, reference, seconds in regressions:
+        print(f"REGRESSION {name}: {reference * 1e6:.1f} µs -> {seconds * 1e6:.1f} µs ({seconds / reference:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+from knowledge_base import compile_kb
+from backward_chaining import solve_opt, result_cache_of, _encode_query
+from result_cache import QueryCache
+from sat_solver import SatSolver, TRUE
+from forward_chaining import HornRules
+from tabling import tables_of
+
+
+def _classify_forward(kb, facts, labels):
+    """One forward chaining pass derives everything the Horn rules entail."""
+    entailed, consistent = kb.engine('horn', HornRules).entailed(facts)
+    if not consistent:
+        return labels
+    return [label for label in labels if label in entailed]
+
+
+def _classify_sat(kb, facts, labels):
+    """
+    A label false in some model of KB ∧ facts is not entailed, so every model the solver
+    finds rules out all the labels it falsifies; only the remaining labels need their
+    own refutation, and those reuse the clauses learned for the others.
+    """
+    solver = kb.engine('sat', SatSolver)
+    assumptions = [solver.encode_goal(kb.symbols, fact) for fact in facts]
+    goals = {label: solver.encode_goal(kb.symbols, label) for label in labels}
+    if not solver.solve(assumptions):
+        return labels  # The facts contradict the KB, which then entails every label
+    candidates = [label for label in labels if solver.value(goals[label]) == TRUE]
+
+    entailed = set()
+    while candidates:
+        label = candidates.pop()
+        if solver.solve(assumptions + [-goals[label]]):
+            candidates = [other for other in candidates if solver.value(goals[other]) == TRUE]
+        else:
+            entailed.add(label)
+    return [label for label in labels if label in entailed]
+
+
+def _classify_tabled(kb, facts, labels):
+    """All labels are proved on the tables of one assumption set, so completed goals are shared."""
+    entailed = []
+    for label in labels:
+        encoded = _encode_query(kb, [label], facts)
+        if encoded is not None:
+            goals, assumptions = encoded
+            if all(tables_of(kb, assumptions).prove(goal) for goal in goals):
+                entailed.append(label)
+    return entailed
+
+
+def _classify_sld(kb, facts, labels):
+    """All labels are searched with one result cache, so sub-goals answered for one are reused."""
+    encoded = _encode_query(kb, [], facts)
+    cache = QueryCache(result_cache_of(kb), encoded[1])
+    entailed = [label for label in labels if solve_opt(kb, [label], cache=cache, assumptions=facts)]
+    cache.commit()
+    return entailed
+
+
+CLASSIFIERS = {
+    'forward': _classify_forward,
+    'sat': _classify_sat,
+    'tabled': _classify_tabled,
+    'sld': _classify_sld
+}
+
+
+def classify(kb, facts, labels, method='forward'):
+    """
+    Return the labels (literal strings, such as the THEN targets of ingest.rule_conclusions)
+    that the KB entails given the facts, in the order given. The labels share one pass
+    of the method, and each label gets the answer the method's solver (solve_forward,
+    solve_sat, solve_tabled or solve_opt) gives with the facts as assumptions:
+    'forward' derives every label at once from the Horn rules, 'sat' rules labels out
+    with the models it finds, and 'tabled' and 'sld' reuse their tables or result cache.
+    """
+    if method not in CLASSIFIERS:
+        raise ValueError(f"Unknown classification method: {method} (expected one of {', '.join(CLASSIFIERS)})")
+    kb = compile_kb(kb)
+    return CLASSIFIERS[method](kb, list(facts), list(dict.fromkeys(labels)))
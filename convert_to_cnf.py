@@ -1,6 +1,40 @@
+from itertools import count
 from logic_node import LogicNode
 from tokenizer import tokenize, parse_tokens
-from utils import is_tautology
+from utils import is_tautology, negate_literal
+
+CNF_MODES = ('equivalent', 'equisatisfiable')
+
+def _transform(node, memo, dependencies, combine):
+    """
+    Explicit-stack, memoized bottom-up evaluation shared by the CNF passes.
+
+    dependencies(node, memo) lists the nodes whose results must be in memo before
+    combine(node, memo) can build the result for node; it is asked again once
+    those are done, so a pass can depend on results computed from earlier ones.
+    LogicNodes are hash-consed, so shared subformulas are transformed only once.
+    Runs in time linear in the number of distinct nodes, at any nesting depth.
+    """
+    if node is None:
+        return None
+    if memo is None:
+        memo = {}
+
+    stack = [node]
+    while stack:
+        current = stack[-1]
+        if current in memo:
+            stack.pop()
+            continue
+        pending = [dependency for dependency in dependencies(current, memo) if dependency not in memo]
+        if pending:
+            stack.extend(reversed(pending))  # Leftmost dependency first
+            continue
+        stack.pop()
+        memo[current] = combine(current, memo)
+
+    return memo[node]
+
 
 def parse_formula(formula):
     """
@@ -11,36 +45,30 @@ def parse_formula(formula):
     return tree
 
 
-def eliminate_implications(node):
-    """
-    Step 1: Eliminate implications and equivalences
-    P → Q becomes ¬P ∨ Q
-    P ↔ Q becomes (¬P ∨ Q) ∧ (¬Q ∨ P)
-    """
-    if node is None:
-        return None
-    
-    if node.type == 'var':
-        return node
-    
+def _eliminate_dependencies(node, memo):
+    if node.type == 'not':
+        return [node.left]
+    if node.type in ('and', 'or', 'implies', 'equiv'):
+        return [node.left, node.right]
+    return []
+
+
+def _eliminate_combine(node, memo):
     if node.type == 'not':
-        return LogicNode('not', left=eliminate_implications(node.left))
+        return LogicNode('not', left=memo[node.left])
     
     if node.type == 'and' or node.type == 'or':
-        return LogicNode(node.type, 
-                         left=eliminate_implications(node.left),
-                         right=eliminate_implications(node.right))
+        return LogicNode(node.type, left=memo[node.left], right=memo[node.right])
     
     if node.type == 'implies':
         # P → Q becomes ¬P ∨ Q
-        not_p = LogicNode('not', left=eliminate_implications(node.left))
-        q = eliminate_implications(node.right)
-        return LogicNode('or', left=not_p, right=q)
+        not_p = LogicNode('not', left=memo[node.left])
+        return LogicNode('or', left=not_p, right=memo[node.right])
     
     if node.type == 'equiv':
         # P ↔ Q becomes (P → Q) ∧ (Q → P)
-        p = eliminate_implications(node.left)
-        q = eliminate_implications(node.right)
+        p = memo[node.left]
+        q = memo[node.right]
         
         # (P → Q) becomes (¬P ∨ Q)
         not_p = LogicNode('not', left=p)
@@ -55,97 +83,138 @@ def eliminate_implications(node):
     return node
 
 
-def push_negation_inward(node):
+def eliminate_implications(node, memo=None):
     """
-    Step 2: Push negations inward using De Morgan's laws
-    ¬(P ∧ Q) becomes ¬P ∨ ¬Q
-    ¬(P ∨ Q) becomes ¬P ∧ ¬Q
-    ¬¬P becomes P
+    Step 1: Eliminate implications and equivalences
+    P → Q becomes ¬P ∨ Q
+    P ↔ Q becomes (¬P ∨ Q) ∧ (¬Q ∨ P)
+    memo, if given, maps already transformed nodes to their results; passing the
+    same dict to several calls shares that work between them.
     """
-    if node is None:
-        return None
-    
-    if node.type == 'var':
-        return node
-    
+    return _transform(node, memo, _eliminate_dependencies, _eliminate_combine)
+
+
+def _negation_dependencies(node, memo):
+    if node.type == 'not':
+        if node.left.type == 'not':
+            return [node.left.left]
+        if node.left.type == 'and' or node.left.type == 'or':
+            return [LogicNode('not', left=node.left.left), LogicNode('not', left=node.left.right)]
+        return [node.left]
+    if node.type == 'and' or node.type == 'or':
+        return [node.left, node.right]
+    return []
+
+
+def _negation_combine(node, memo):
     if node.type == 'not':
         if node.left.type == 'not':
             # Double negation: ¬¬P becomes P
-            return push_negation_inward(node.left.left)
+            return memo[node.left.left]
         
         if node.left.type == 'and':
             # De Morgan's law: ¬(P ∧ Q) becomes ¬P ∨ ¬Q
             not_p = LogicNode('not', left=node.left.left)
             not_q = LogicNode('not', left=node.left.right)
-            return LogicNode('or', 
-                             left=push_negation_inward(not_p),
-                             right=push_negation_inward(not_q))
+            return LogicNode('or', left=memo[not_p], right=memo[not_q])
         
         if node.left.type == 'or':
             # De Morgan's law: ¬(P ∨ Q) becomes ¬P ∧ ¬Q
             not_p = LogicNode('not', left=node.left.left)
             not_q = LogicNode('not', left=node.left.right)
-            return LogicNode('and', 
-                             left=push_negation_inward(not_p),
-                             right=push_negation_inward(not_q))
+            return LogicNode('and', left=memo[not_p], right=memo[not_q])
         
         # If none of the above, just push the negation down
-        return LogicNode('not', left=push_negation_inward(node.left))
+        return LogicNode('not', left=memo[node.left])
     
     if node.type == 'and' or node.type == 'or':
-        return LogicNode(node.type, 
-                         left=push_negation_inward(node.left),
-                         right=push_negation_inward(node.right))
+        return LogicNode(node.type, left=memo[node.left], right=memo[node.right])
     
     return node
 
 
-def distribute_or_over_and(node):
+def push_negation_inward(node, memo=None):
     """
-    Step 3: Distribute OR over AND
-    P ∨ (Q ∧ R) becomes (P ∨ Q) ∧ (P ∨ R)
-    (P ∧ Q) ∨ R becomes (P ∨ R) ∧ (Q ∨ R)
+    Step 2: Push negations inward using De Morgan's laws
+    ¬(P ∧ Q) becomes ¬P ∨ ¬Q
+    ¬(P ∨ Q) becomes ¬P ∧ ¬Q
+    ¬¬P becomes P
+    memo, if given, maps already transformed nodes to their results; passing the
+    same dict to several calls shares that work between them.
     """
-    if node is None:
-        return None
+    return _transform(node, memo, _negation_dependencies, _negation_combine)
+
+
+def _distribution_dependencies(node, memo):
+    if node.type == 'var' or node.type == 'not' and node.left.type == 'var':
+        return []
+    
+    if node.type == 'not':
+        return [node.left]
+    
+    if node.type == 'and':
+        return [node.left, node.right]
+    
+    if node.type == 'or':
+        if node.left not in memo or node.right not in memo:
+            return [node.left, node.right]
+        
+        # Once both sides are distributed, the new disjunctions must be distributed too
+        left = memo[node.left]
+        right = memo[node.right]
+        if left.type == 'and':
+            return [LogicNode('or', left=left.left, right=right),
+                    LogicNode('or', left=left.right, right=right)]
+        if right.type == 'and':
+            return [LogicNode('or', left=left, right=right.left),
+                    LogicNode('or', left=left, right=right.right)]
     
+    return []
+
+
+def _distribution_combine(node, memo):
     if node.type == 'var' or node.type == 'not' and node.left.type == 'var':
         return node
     
     if node.type == 'not':
-        return LogicNode('not', left=distribute_or_over_and(node.left))
+        return LogicNode('not', left=memo[node.left])
     
     if node.type == 'and':
-        return LogicNode('and', 
-                         left=distribute_or_over_and(node.left),
-                         right=distribute_or_over_and(node.right))
+        return LogicNode('and', left=memo[node.left], right=memo[node.right])
     
     if node.type == 'or':
-        left = distribute_or_over_and(node.left)
-        right = distribute_or_over_and(node.right)
+        left = memo[node.left]
+        right = memo[node.right]
         
         # Check if we need to distribute
         if left.type == 'and':
             # (P ∧ Q) ∨ R becomes (P ∨ R) ∧ (Q ∨ R)
             p_or_r = LogicNode('or', left=left.left, right=right)
             q_or_r = LogicNode('or', left=left.right, right=right)
-            return LogicNode('and', 
-                             left=distribute_or_over_and(p_or_r),
-                             right=distribute_or_over_and(q_or_r))
+            return LogicNode('and', left=memo[p_or_r], right=memo[q_or_r])
         
         if right.type == 'and':
             # P ∨ (Q ∧ R) becomes (P ∨ Q) ∧ (P ∨ R)
             p_or_q = LogicNode('or', left=left, right=right.left)
             p_or_r = LogicNode('or', left=left, right=right.right)
-            return LogicNode('and', 
-                             left=distribute_or_over_and(p_or_q),
-                             right=distribute_or_over_and(p_or_r))
+            return LogicNode('and', left=memo[p_or_q], right=memo[p_or_r])
         
         return LogicNode('or', left=left, right=right)
     
     return node
 
 
+def distribute_or_over_and(node, memo=None):
+    """
+    Step 3: Distribute OR over AND
+    P ∨ (Q ∧ R) becomes (P ∨ Q) ∧ (P ∨ R)
+    (P ∧ Q) ∨ R becomes (P ∨ R) ∧ (Q ∨ R)
+    memo, if given, maps already transformed nodes to their results; passing the
+    same dict to several calls shares that work between them.
+    """
+    return _transform(node, memo, _distribution_dependencies, _distribution_combine)
+
+
 def convert_to_cnf(formula):
     """
     Convert a propositional logic formula to Conjunctive Normal Form (CNF)
@@ -165,62 +234,184 @@ def convert_to_cnf(formula):
     return cnf
 
 
+def _collect_or_literals(or_node, clause_set):
+    """
+    Collect the literals of an OR expression into clause_set, left to right.
+    """
+    stack = [or_node]
+    while stack:
+        current = stack.pop()
+        if current.type == 'var':
+            clause_set.add(current.value)
+        elif current.type == 'not' and current.left.type == 'var':
+            clause_set.add(f"¬{current.left.value}")
+        elif current.type == 'or':
+            stack.append(current.right)
+            stack.append(current.left)
+        else:
+            # This shouldn't happen in a well-formed CNF
+            sub_result = node_to_list_of_lists(current)
+            for sub_clause in sub_result:
+                clause_set.update(sub_clause)
+
+
 def node_to_list_of_lists(node):
     """
     Convert a CNF node to a list of lists representation
     [[p, q]] means p or q
     [[p], [q, r]] means p and (q or r)
     """
+    result = []
+    stack = [node] if node is not None else []
+    while stack:
+        current = stack.pop()
+        
+        if current.type == 'var':
+            result.append([current.value])
+        
+        elif current.type == 'not' and current.left.type == 'var':
+            # Negated variable, represent as "¬p"
+            result.append([f"¬{current.left.value}"])
+        
+        elif current.type == 'or':
+            # For OR, we combine literals into a single clause
+            clause = set()  # Use a set to remove duplicates
+            _collect_or_literals(current, clause)
+            result.append(list(set(clause)))  # Remove duplicates by converting to a set and back to a list
+        
+        elif current.type == 'and':
+            # For AND, we combine clauses from left and right
+            stack.append(current.right)
+            stack.append(current.left)
+        
+        else:
+            result.append([str(current)])
+    
+    return result
+
+
+def _variable_names(node):
+    """
+    Collect the names of all variables in a parse tree.
+    """
+    names = set()
+    seen = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        if current.type == 'var':
+            names.add(current.value)
+        else:
+            stack.extend(child for child in (current.left, current.right) if child is not None)
+    return names
+
+
+def _fresh_aux_name(aux_ids, reserved, symbols=None):
+    """
+    Return the next auxiliary variable name that is neither one of the formula's
+    own variables nor already in the symbol table.
+    """
+    while True:
+        name = f"_T{next(aux_ids)}"
+        if name not in reserved and (symbols is None or name not in symbols.ids):
+            return name
+
+
+def tseitin_clauses(node, symbols=None, aux_ids=None):
+    """
+    Equisatisfiable CNF (Tseitin encoding) of a parse tree as a list of lists.
+    Every compound subformula gets an auxiliary variable x with clauses for
+    x ↔ subformula, so the output grows linearly with the size of the formula:
+    A ∧ B  gives (¬x ∨ A), (¬x ∨ B), (x ∨ ¬A ∨ ¬B)
+    A ∨ B  gives (¬x ∨ A ∨ B), (x ∨ ¬A), (x ∨ ¬B)
+    A → B  gives (¬x ∨ ¬A ∨ B), (x ∨ A), (x ∨ ¬B)
+    A ↔ B  gives (¬x ∨ ¬A ∨ B), (¬x ∨ A ∨ ¬B), (x ∨ A ∨ B), (x ∨ ¬A ∨ ¬B)
+    Conjunctions at the top level are asserted directly, without auxiliaries.
+
+    Auxiliaries are named _T1, _T2, ... from aux_ids (a fresh count(1) per call by
+    default), skipping names the formula or the SymbolTable already uses, so the
+    same formula always gives the same clauses. When clause lists from several
+    calls are combined, either encode them through one SymbolTable or pass one
+    shared aux_ids counter so that their auxiliaries stay distinct.
+    """
     if node is None:
         return []
-    
-    if node.type == 'var':
-        return [[node.value]]
-    
-    if node.type == 'not' and node.left.type == 'var':
-        # Negated variable, represent as "¬p"
-        return [[f"¬{node.left.value}"]]
-    
-    if node.type == 'or':
-        # For OR, we combine literals into a single clause
-        result = []
-        clause = set()  # Use a set to remove duplicates
-
-        # Helper function to collect literals in an OR expression
-        def collect_or_literals(or_node, clause_set):
-            if or_node.type == 'var':
-                clause_set.add(or_node.value)
-            elif or_node.type == 'not' and or_node.left.type == 'var':
-                clause_set.add(f"¬{or_node.left.value}")
-            elif or_node.type == 'or':
-                collect_or_literals(or_node.left, clause_set)
-                collect_or_literals(or_node.right, clause_set)
-            else:
-                # This shouldn't happen in a well-formed CNF
-                sub_result = node_to_list_of_lists(or_node)
-                for sub_clause in sub_result:
-                    clause_set.update(sub_clause)
+    if aux_ids is None:
+        aux_ids = count(1)
+    reserved = _variable_names(node)
 
-        collect_or_literals(node, clause)
-        result.append(list(set(clause)))  # Remove duplicates by converting to a set and back to a list
+    clauses = []
 
-        return result
-    
-    if node.type == 'and':
-        # For AND, we combine clauses from left and right
-        left_clauses = node_to_list_of_lists(node.left)
-        right_clauses = node_to_list_of_lists(node.right)
-        return left_clauses + right_clauses
-    
-    return [[str(node)]]
+    def dependencies(subformula, literals):
+        if subformula.type == 'var':
+            return []
+        if subformula.type == 'not':
+            return [subformula.left]
+        return [subformula.left, subformula.right]
+
+    def literal_for_subformula(subformula, literals):
+        if subformula.type == 'var':
+            return subformula.value
+        if subformula.type == 'not':
+            return negate_literal(literals[subformula.left])
 
+        a = literals[subformula.left]
+        b = literals[subformula.right]
+        x = _fresh_aux_name(aux_ids, reserved, symbols)
+        not_a, not_b, not_x = negate_literal(a), negate_literal(b), negate_literal(x)
 
-def convert_to_cnf_list(formula):
+        if subformula.type == 'and':
+            clauses.extend([[not_x, a], [not_x, b], [x, not_a, not_b]])
+        elif subformula.type == 'or':
+            clauses.extend([[not_x, a, b], [x, not_a], [x, not_b]])
+        elif subformula.type == 'implies':
+            clauses.extend([[not_x, not_a, b], [x, a], [x, not_b]])
+        elif subformula.type == 'equiv':
+            clauses.extend([[not_x, not_a, b], [not_x, a, not_b], [x, a, b], [x, not_a, not_b]])
+        else:
+            raise ValueError(f"Unknown node type: {subformula.type}")
+        return x
+
+    literals = {}  # subformula -> literal standing for it
+
+    def literal_for(subformula):
+        return _transform(subformula, literals, dependencies, literal_for_subformula)
+
+    # Assert each top-level conjunct as a unit clause
+    conjuncts = [node]
+    while conjuncts:
+        conjunct = conjuncts.pop()
+        if conjunct.type == 'and':
+            conjuncts.append(conjunct.right)
+            conjuncts.append(conjunct.left)
+        else:
+            clauses.append([literal_for(conjunct)])
+
+    return [list(dict.fromkeys(clause)) for clause in clauses]  # Drop repeated literals
+
+
+def convert_to_cnf_list(formula, symbols=None, mode='equivalent', aux_ids=None):
     """
-    Convert a propositional logic formula to a list of lists representation of CNF
+    Convert a propositional logic formula to a list of lists representation of CNF.
+    mode='equivalent' distributes OR over AND, which can grow exponentially;
+    mode='equisatisfiable' uses the Tseitin encoding, which introduces auxiliary
+    variables named _T1, _T2, ... but grows linearly with the formula
+    (see tseitin_clauses for how aux_ids numbers them).
+    If a SymbolTable is given, the clauses are returned integer-encoded through it.
     """
-    cnf_node = convert_to_cnf(formula)
-    cnf_list = node_to_list_of_lists(cnf_node)
+    if mode == 'equivalent':
+        cnf_node = convert_to_cnf(formula)
+        cnf_list = node_to_list_of_lists(cnf_node)
+    elif mode == 'equisatisfiable':
+        cnf_list = tseitin_clauses(parse_formula(formula), symbols, aux_ids)
+    else:
+        raise ValueError(f"Unknown CNF mode: {mode} (expected one of {CNF_MODES})")
+
+    if symbols is not None:
+        cnf_list = [symbols.encode_clause(clause) for clause in cnf_list]
     cnf_list = [clause for clause in cnf_list if not is_tautology(clause)]
     return cnf_list
 
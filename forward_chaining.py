@@ -0,0 +1,112 @@
+from collections import deque
+from knowledge_base import compile_kb
+from ingest import load_kb
+from instrumentation import counters
+
+
+class HornRules:
+    """
+    Horn clauses of a KnowledgeBase compiled for linear-time forward chaining
+    (Dowling–Gallier): each rule keeps a count of premises not yet derived, and
+    each literal lists the rules it is a premise of.
+
+    A clause with exactly one positive literal L, e.g. (¬S05 ∨ ¬S12 ∨ L02),
+    becomes the rule S05 ∧ S12 → L02; a clause without a positive literal is a
+    constraint whose premises must not all hold. Clauses with more than one
+    positive literal are not Horn; they are skipped and counted in non_horn.
+    """
+
+    def __init__(self, kb):
+        self.kb = compile_kb(kb)
+        self.premise_counts = []  # rule id -> number of premises
+        self.conclusions = []  # rule id -> encoded conclusion, or None for a constraint
+        self.rules_with_premise = {}  # encoded literal -> ids of the rules it is a premise of
+        self.facts = []  # encoded unit clauses of the KB
+        self.non_horn = 0
+
+        for clause in self.kb.encoded_clauses():
+            literals = set(clause)
+            positives = [literal for literal in literals if literal > 0]
+            if len(positives) > 1:
+                self.non_horn += 1
+                continue
+            if len(literals) == 1:
+                self.facts.append(positives[0] if positives else clause[0])
+                continue
+
+            conclusion = positives[0] if positives else None
+            rule_id = len(self.conclusions)
+            self.conclusions.append(conclusion)
+            premises = [-literal for literal in literals if literal != conclusion]
+            self.premise_counts.append(len(premises))
+            for premise in premises:
+                self.rules_with_premise.setdefault(premise, []).append(rule_id)
+
+    def derive(self, facts=()):
+        """
+        Derive every literal entailed by the Horn rules, the KB's unit clauses and the
+        given encoded facts, in time linear in the size of the rules.
+        Returns (derived literals, consistent); consistent is False when a constraint
+        fired, in which case the facts contradict the KB and everything is entailed.
+        """
+        remaining = list(self.premise_counts)
+        derived = set()
+        agenda = deque(self.facts)
+        agenda.extend(facts)
+        consistent = True
+        fired = 0
+
+        while agenda:
+            literal = agenda.popleft()
+            if literal in derived:
+                continue
+            derived.add(literal)
+            if -literal in derived:
+                consistent = False
+            for rule_id in self.rules_with_premise.get(literal, ()):
+                remaining[rule_id] -= 1
+                if remaining[rule_id] == 0:
+                    fired += 1
+                    conclusion = self.conclusions[rule_id]
+                    if conclusion is None:
+                        consistent = False
+                    elif conclusion not in derived:
+                        agenda.append(conclusion)
+
+        if counters.enabled:
+            counters.add(facts_derived=len(derived), rules_fired=fired)
+        return derived, consistent
+
+    def entailed(self, facts=()):
+        """
+        Like derive(), but takes and returns literal strings. Facts naming symbols the
+        KB does not know cannot trigger any rule and are returned unchanged.
+        """
+        lookup = self.kb.symbols.lookup
+        encoded_facts = [lookup(fact) for fact in facts]
+        derived, consistent = self.derive([fact for fact in encoded_facts if fact is not None])
+        decode = self.kb.symbols.decode
+        entailed = {decode(literal) for literal in derived}
+        entailed.update(fact for fact, encoded in zip(facts, encoded_facts) if encoded is None)
+        return entailed, consistent
+
+
+def load_horn_rules(patterns):
+    """
+    Compile one or more rule files (S.. AND S.. THEN L..), given as paths or globs, into HornRules.
+    """
+    return HornRules(load_kb(patterns))
+
+
+def solve_forward(kb, query, assumptions=()):
+    """
+    Forward chaining with premise counters, with the same signature as solve().
+    Unit clauses of the KB and the assumptions are the facts; the query (a
+    conjunction of literals) holds when every literal is derived. Only the Horn
+    clauses of the KB are used, and a compiled KnowledgeBase keeps them across calls.
+    """
+    rules = compile_kb(kb).engine('horn', HornRules)
+    entailed, consistent = rules.entailed(assumptions)
+    if not consistent:
+        return True
+    return all(literal in entailed for literal in query)
@@ -0,0 +1,63 @@
+def first_goal(kb, goals, assumptions):
+    """Resolve the goal with the smallest encoded literal, the default."""
+    return goals[0]
+
+
+def _alternatives(kb, goal, assumptions):
+    return len(kb.clause_ids(goal)) + (goal in assumptions)
+
+
+def fail_first(kb, goals, assumptions):
+    """
+    Resolve the goal with the fewest clauses (and assumption) to resolve it against.
+    A goal with none fails the whole goal set before any other goal is expanded.
+    """
+    return min(goals, key=lambda goal: _alternatives(kb, goal, assumptions))
+
+
+def most_constrained(kb, goals, assumptions):
+    """
+    Resolve the goal whose symbol occurs in the most clauses, with either sign, so the
+    truth values verify_solution checks are set where they constrain the most clauses.
+    Ties go to the goal with fewer alternatives.
+    """
+    def constraint(goal):
+        alternatives = _alternatives(kb, goal, assumptions)
+        return -(alternatives + len(kb.clause_ids(-goal))), alternatives
+    return min(goals, key=constraint)
+
+
+def priority(scores):
+    """
+    A strategy resolving the goal with the highest score first. scores maps literal
+    strings, such as '¬S02', to numbers, set by hand or learned from earlier runs;
+    literals without a score count as 0, and ties go to the smallest encoded literal.
+    """
+    def select(kb, goals, assumptions):
+        decode = kb.symbols.decode
+        return max(goals, key=lambda goal: (scores.get(decode(goal), 0), -goal))
+    return select
+
+
+STRATEGIES = {
+    'first': first_goal,
+    'fail_first': fail_first,
+    'most_constrained': most_constrained
+}
+
+
+def selection_strategy(select):
+    """
+    Resolve the select argument of solve() and solve_opt(): None for first_goal, a name
+    in STRATEGIES, or a strategy. A strategy is called as strategy(kb, goals, assumptions)
+    with a compiled KB, the goal set as a sorted tuple of at least two encoded literals
+    and the encoded assumptions, and returns the goal to resolve next. Any choice is
+    sound; strategies depend only on their arguments, so a query always takes the same path.
+    """
+    if select is None:
+        return first_goal
+    if isinstance(select, str):
+        if select not in STRATEGIES:
+            raise ValueError(f"Unknown goal selection strategy: {select} (expected one of {', '.join(STRATEGIES)})")
+        return STRATEGIES[select]
+    return select
@@ -0,0 +1,101 @@
+import glob
+import hashlib
+import os
+from utils import iter_logical_format
+from convert_to_cnf import convert_to_cnf_list
+from knowledge_base import KnowledgeBase, read_kb, write_kb
+
+KB_CACHE_DIR = "output/kb_cache"
+
+
+def iter_rule_files(patterns):
+    """
+    Expand file paths and glob patterns into rule file paths, in order and without repeats.
+    A pattern that matches nothing raises ValueError rather than loading an empty KB.
+    """
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    seen = set()
+    for pattern in patterns:
+        paths = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not paths:
+            raise ValueError(f"No rule files match: {pattern}")
+        for path in paths:
+            if path not in seen:
+                seen.add(path)
+                yield path
+
+
+def iter_expressions(patterns):
+    """Yield the logical expression of every rule line of every file, one at a time."""
+    for path in iter_rule_files(patterns):
+        yield from iter_logical_format(path)
+
+
+def rule_conclusions(patterns):
+    """
+    Return the conclusion symbols of the rules (the THEN targets), in order of first
+    appearance, for use as the labels of classify().
+    """
+    conclusions = {}
+    for path in iter_rule_files(patterns):
+        with open(path, "r") as file:
+            for line in file:
+                parts = line.split()
+                if "THEN" in parts[:-1]:
+                    conclusions[parts[parts.index("THEN") + 1]] = None
+    return list(conclusions)
+
+
+def iter_clauses(patterns, symbols=None, mode='equivalent'):
+    """
+    Yield the CNF clauses of every rule, encoded through symbols if it is given.
+    """
+    for expression in iter_expressions(patterns):
+        yield from convert_to_cnf_list(expression, symbols, mode)
+
+
+def load_kb(patterns, kb=None, mode='equivalent'):
+    """
+    Stream rule files into a KnowledgeBase, line by line: each rule is converted to CNF
+    and its clauses are added before the next line is read, so memory grows with the
+    KB, not with the files. Rules are added to kb if it is given, else to a new KB.
+    """
+    if kb is None:
+        kb = KnowledgeBase()
+    for clause in iter_clauses(patterns, kb.symbols, mode):
+        kb.add_encoded_clause(clause)
+    return kb
+
+
+def rules_digest(paths, mode='equivalent'):
+    """
+    Content hash of a list of rule files and the CNF mode they are converted with.
+    """
+    digest = hashlib.sha256(mode.encode())
+    for path in paths:
+        digest.update(b"\0" + os.path.abspath(path).encode() + b"\0")
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_kb_cached(patterns, cache_dir=KB_CACHE_DIR, mode='equivalent'):
+    """
+    Like load_kb(), but keeps the compiled KB on disk, named by the content hash of the
+    rule files. A later call with unchanged files memory-maps it instead of parsing the
+    rules again; changing any file changes the hash, so the KB is rebuilt and cached anew.
+    """
+    paths = list(iter_rule_files(patterns))
+    cache_path = os.path.join(cache_dir, f"{rules_digest(paths, mode)}.kb")
+    if os.path.exists(cache_path):
+        try:
+            return read_kb(cache_path)
+        except ValueError:
+            pass  # Written by another version or machine: rebuild it
+
+    kb = load_kb(paths, mode=mode)
+    os.makedirs(cache_dir, exist_ok=True)
+    write_kb(kb, cache_path)
+    return kb
@@ -0,0 +1,88 @@
+import contextlib, cProfile, io, os, pstats
+
+# Counters that combine by maximum rather than by sum
+MAX_COUNTERS = {'max_depth'}
+
+
+class Counters:
+    """
+    Work counters for the solvers, off unless enabled.
+
+    Solvers count in locals or in their engines and add to the shared counters once
+    per query, guarded by `if counters.enabled:`, so a disabled instance costs one
+    attribute read per query. The SLD solvers count resolution_steps (clauses and
+    assumptions resolved against), clauses_scanned (candidate clauses of the goals
+    expanded), cache_hits, cache_misses, cycle_cutoffs, verify_calls and max_depth;
+    the other solvers count the work of their own algorithm.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.values = {}
+
+    def add(self, **counts):
+        values = self.values
+        for name, count in counts.items():
+            values[name] = values.get(name, 0) + count
+
+    def record_max(self, name, value):
+        if name not in self.values or value > self.values[name]:
+            self.values[name] = value
+
+
+counters = Counters()
+
+
+@contextlib.contextmanager
+def counting():
+    """
+    Enable the shared counters for a block; yields a dict that receives the counts
+    of the block when it ends. Blocks may be nested.
+    """
+    enabled, outer = counters.enabled, counters.values
+    counters.enabled, counters.values = True, {}
+    counts = {}
+    try:
+        yield counts
+    finally:
+        counts.update(counters.values)
+        counters.enabled, counters.values = enabled, outer
+        if enabled:
+            counters.add(**{name: count for name, count in counts.items() if name not in MAX_COUNTERS})
+            for name in MAX_COUNTERS.intersection(counts):
+                counters.record_max(name, counts[name])
+
+
+def combine(samples):
+    """Aggregate the counts of many queries: totals, except maxima for MAX_COUNTERS."""
+    combined = {}
+    for counts in samples:
+        for name, count in counts.items():
+            if name in MAX_COUNTERS:
+                combined[name] = max(combined.get(name, 0), count)
+            else:
+                combined[name] = combined.get(name, 0) + count
+    return combined
+
+
+def profile_query(solver, kb, query, assumptions=(), path=None, sort='cumulative', limit=25):
+    """
+    Run one query under cProfile. The raw profile is saved to path if given, for
+    pstats or snakeviz. Returns (result, summary) where summary holds the call and
+    time totals and the report of the limit most expensive functions by sort.
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(solver, kb, query, assumptions=assumptions)
+    if path is not None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        profiler.dump_stats(path)
+
+    report = io.StringIO()
+    stats = pstats.Stats(profiler, stream=report)
+    stats.sort_stats(sort).print_stats(limit)
+    summary = {
+        'total_calls': stats.total_calls,
+        'total_time_ms': stats.total_tt * 1000,
+        'report': report.getvalue()
+    }
+    return result, summary
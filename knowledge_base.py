@@ -0,0 +1,241 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+# Compiled KB file: magic, byte order, then the byte length of the symbol names and the
+# number of literals, offsets, index keys and index entries, followed by those sections
+KB_FILE_MAGIC = b"HCKB\x01"
+_KB_HEADER = struct.Struct("<5sc5Q")
+_SECTION_ALIGNMENT = 8
+
+
+class SymbolTable:
+    """
+    Interns proposition symbols as positive integers.
+
+    A literal is encoded as the signed id of its symbol: 'S04' becomes 4 (say)
+    and '¬S04' becomes -4, so negating an encoded literal is just `-lit`.
+    """
+
+    def __init__(self, names=()):
+        self.names = [None]  # id -> symbol name; id 0 is never used
+        self.ids = {}  # symbol name -> id
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name):
+        """Return the id of a symbol, assigning the next free id if it is new."""
+        symbol_id = self.ids.get(name)
+        if symbol_id is None:
+            symbol_id = len(self.names)
+            self.ids[name] = symbol_id
+            self.names.append(name)
+        return symbol_id
+
+    def encode(self, literal):
+        """Encode a literal such as '¬S04' as a signed integer."""
+        if literal.startswith("¬"):
+            return -self.intern(literal[1:])
+        return self.intern(literal)
+
+    def decode(self, literal):
+        """Decode a signed integer back into its literal string."""
+        if literal < 0:
+            return f"¬{self.names[-literal]}"
+        return self.names[literal]
+
+    def lookup(self, literal):
+        """
+        Encode a literal without interning it; returns None for an unknown symbol.
+        Use this for queries so that looking up a symbol never changes the table.
+        """
+        negated = literal.startswith("¬")
+        symbol_id = self.ids.get(literal[1:] if negated else literal)
+        if symbol_id is None:
+            return None
+        return -symbol_id if negated else symbol_id
+
+    def encode_clause(self, clause):
+        return [self.encode(literal) for literal in clause]
+
+    def decode_clause(self, clause):
+        return [self.decode(literal) for literal in clause]
+
+    def decode_assignment(self, assignment):
+        """Decode the keys of a truth assignment over encoded literals."""
+        return {self.decode(literal): value for literal, value in assignment.items()}
+
+    def __len__(self):
+        return len(self.names) - 1
+
+
+class KnowledgeBase:
+    """
+    Compiled knowledge base: integer-encoded CNF clauses plus an index from
+    each literal to the clauses that contain it.
+
+    The literals of all clauses are stored back to back in one flat int array;
+    clause i spans literals[offsets[i]:offsets[i + 1]]. Iterating over a
+    KnowledgeBase yields its clauses decoded as lists of strings, so it can be
+    passed anywhere a plain list of clauses is accepted.
+    """
+
+    def __init__(self, clauses=(), symbols=None):
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.literals = array('i')
+        self.offsets = array('q', [0])
+        self.index = {}  # encoded literal -> ids of the clauses containing it
+        self.engines = {}  # name -> solver state built from the clauses, see engine()
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def add_clause(self, clause):
+        """Encode a clause of literal strings and append it to the KB."""
+        return self.add_encoded_clause(self.symbols.encode_clause(clause))
+
+    def add_encoded_clause(self, clause):
+        """Append an already encoded clause to the KB and index its literals."""
+        if not isinstance(self.literals, array):
+            self._detach()
+        clause_id = len(self.offsets) - 1
+        self.engines.clear()
+        self.literals.extend(clause)
+        self.offsets.append(len(self.literals))
+        for literal in set(clause):
+            if literal in self.index:
+                self.index[literal].append(clause_id)
+            else:
+                self.index[literal] = array('i', [clause_id])
+        return clause_id
+
+    def clause(self, clause_id):
+        """Return the encoded literals of a clause."""
+        return self.literals[self.offsets[clause_id]:self.offsets[clause_id + 1]]
+
+    def encoded_clauses(self):
+        """Iterate over all clauses in their encoded form."""
+        literals, offsets = self.literals, self.offsets
+        for clause_id in range(len(offsets) - 1):
+            yield literals[offsets[clause_id]:offsets[clause_id + 1]]
+
+    def clause_ids(self, literal):
+        """
+        Return the ids of the clauses containing an encoded literal, in KB order.
+        The literals of clause i are read in place from
+        literals[offsets[i]:offsets[i + 1]], without copying the clause.
+        """
+        return self.index.get(literal, ())
+
+    def engine(self, name, factory):
+        """
+        Return the solver state registered under name, building it with factory(self)
+        on first use. Engines are compiled once per KB and reused across queries;
+        adding a clause discards them.
+        """
+        engine = self.engines.get(name)
+        if engine is None:
+            engine = self.engines[name] = factory(self)
+        return engine
+
+    def _detach(self):
+        """Copy clauses read from a mapped KB file into arrays of its own, so they can grow."""
+        self.literals = array('i', self.literals)
+        self.offsets = array('q', self.offsets)
+        self.index = {literal: array('i', clause_ids) for literal, clause_ids in self.index.items()}
+
+    def __getstate__(self):
+        # Engines are rebuilt on demand, so they are not pickled with the clauses
+        if not isinstance(self.literals, array):
+            self._detach()
+        state = self.__dict__.copy()
+        state['engines'] = {}
+        return state
+
+    def __iter__(self):
+        decode_clause = self.symbols.decode_clause
+        for clause in self.encoded_clauses():
+            yield decode_clause(clause)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+def compile_kb(kb):
+    """
+    Return kb as a KnowledgeBase, compiling it only if it is a plain list of clauses.
+    """
+    if isinstance(kb, KnowledgeBase):
+        return kb
+    return KnowledgeBase(kb)
+
+
+def _write_section(file, data):
+    file.write(data)
+    file.write(b"\0" * (-len(data) % _SECTION_ALIGNMENT))
+
+
+def write_kb(kb, path):
+    """
+    Write a KnowledgeBase in the compiled KB file format read by read_kb(): its symbol
+    table, clause arrays and literal index. The file is replaced atomically.
+    """
+    kb = compile_kb(kb)
+    names = "\n".join(kb.symbols.names[1:]).encode("utf-8")
+    keys = sorted(kb.index)
+    starts = array('q', [0])
+    entries = array('i')
+    for literal in keys:
+        entries.extend(kb.index[literal])
+        starts.append(len(entries))
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        _write_section(file, _KB_HEADER.pack(KB_FILE_MAGIC, sys.byteorder[0].encode(), len(names),
+                                             len(kb.literals), len(kb.offsets), len(keys), len(entries)))
+        _write_section(file, names)
+        _write_section(file, array('i', kb.literals).tobytes())
+        _write_section(file, array('q', kb.offsets).tobytes())
+        _write_section(file, array('i', keys).tobytes())
+        _write_section(file, starts.tobytes())
+        _write_section(file, entries.tobytes())
+    os.replace(temporary_path, path)
+
+
+def read_kb(path):
+    """
+    Load a file written by write_kb() without parsing any rules. The file is memory-mapped
+    and the clause arrays and index read it in place; only the symbol table is rebuilt.
+    Raises ValueError if the file is not a compiled KB for this machine's byte order.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < _KB_HEADER.size:
+            raise ValueError(f"Not a compiled KB file: {path}")
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, byteorder, names_size, n_literals, n_offsets, n_keys, n_entries = _KB_HEADER.unpack_from(mapping)
+    if magic != KB_FILE_MAGIC or byteorder != sys.byteorder[0].encode():
+        raise ValueError(f"Not a compiled KB file for this machine: {path}")
+
+    view = memoryview(mapping)
+    position = _KB_HEADER.size + (-_KB_HEADER.size % _SECTION_ALIGNMENT)
+
+    def section(size, item_format=None, item_size=1):
+        nonlocal position
+        length = size * item_size
+        if position + length > len(view):
+            raise ValueError(f"Truncated compiled KB file: {path}")
+        data = view[position:position + length]
+        position += length + (-length % _SECTION_ALIGNMENT)
+        return data.cast(item_format) if item_format else data
+
+    names = bytes(section(names_size)).decode("utf-8")
+    kb = KnowledgeBase(symbols=SymbolTable(names.split("\n") if names else ()))
+    kb.literals = section(n_literals, 'i', 4)
+    kb.offsets = section(n_offsets, 'q', 8)
+    keys = section(n_keys, 'i', 4)
+    starts = section(n_keys + 1, 'q', 8)
+    entries = section(n_entries, 'i', 4)
+    kb.index = {keys[i]: entries[starts[i]:starts[i + 1]] for i in range(n_keys)}
+    return kb
@@ -1,10 +1,44 @@
+import weakref
+
+
 class LogicNode:
-    def __init__(self, type, value=None, left=None, right=None):
-        self.type = type  # 'var', 'not', 'and', 'or', 'implies', 'equiv'
-        self.value = value  # for variables
-        self.left = left
-        self.right = right
-    
+    """
+    Immutable, hash-consed syntax tree node.
+
+    Nodes are interned: constructing a node that is structurally identical to a
+    live one returns that same object, so shared subformulas are stored once and
+    `is`/`==` compare structure in constant time.
+    """
+    __slots__ = ('type', 'value', 'left', 'right', '__weakref__')
+
+    # (type, value type, value, id(left), id(right)) -> node. The value's type is part
+    # of the key so that equal values of different types (1 and True) stay distinct.
+    # Children are interned as well, and each entry's node keeps its children alive,
+    # so their ids stay valid.
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, type, value=None, left=None, right=None):
+        key = (type, value.__class__, value, id(left), id(right))
+        node = cls._interned.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            object.__setattr__(node, 'type', type)  # 'var', 'not', 'and', 'or', 'implies', 'equiv'
+            object.__setattr__(node, 'value', value)  # for variables
+            object.__setattr__(node, 'left', left)
+            object.__setattr__(node, 'right', right)
+            cls._interned[key] = node
+        return node
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LogicNode is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("LogicNode is immutable")
+
+    def __reduce__(self):
+        # Re-intern on unpickling/copying instead of restoring the slots directly
+        return (LogicNode, (self.type, self.value, self.left, self.right))
+
     def __str__(self):
         if self.type == 'var':
             return self.value
@@ -17,4 +51,4 @@ class LogicNode:
         elif self.type == 'implies':
             return f"({self.left} → {self.right})"
         elif self.type == 'equiv':
-            return f"({self.left} ↔ {self.right})"
\ No newline at end of file
+            return f"({self.left} ↔ {self.right})"
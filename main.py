@@ -1,10 +1,111 @@
-from utils import convert_to_logical_format
 from backward_chaining import solve, solve_opt
-from convert_to_cnf import convert_to_cnf_list
-import yaml, os, time, psutil, tracemalloc
+from sat_solver import solve_sat
+from forward_chaining import solve_forward
+from tabling import solve_tabled
+from ingest import iter_rule_files, load_kb_cached, rule_conclusions
+from preprocess import preprocess
+from utils import percentile
+from batch import solve_batch
+from instrumentation import counting, combine, profile_query
+from classify import classify, CLASSIFIERS
+import yaml, os, sys, time, psutil, tracemalloc, statistics
+
+WARMUP_RUNS = 3
+TIMED_RUNS = 30
+
+def latency_stats(samples):
+    """Summary of latency samples in milliseconds."""
+    return {
+        'runs': len(samples),
+        'mean_ms': statistics.fmean(samples),
+        'p50_ms': percentile(samples, 50),
+        'p95_ms': percentile(samples, 95),
+        'p99_ms': percentile(samples, 99),
+        'variance_ms2': statistics.variance(samples) if len(samples) > 1 else 0.0,
+        'min_ms': min(samples),
+        'max_ms': max(samples)
+    }
+
+def solve_counted(kb, test_cases, solver, samples):
+    """Answer test cases one at a time, appending the solver counters of each to samples."""
+    for conditions, expected in test_cases:
+        with counting() as counts:
+            result = solver(kb, [expected], assumptions=conditions)
+        samples.append(counts)
+        yield result
+
+def measure_test_suite(kb, test_cases, solver, solver_name, log, warmup=WARMUP_RUNS, runs=TIMED_RUNS):
+    """
+    Measure a suite of tests with warm-up and repeated timed runs.
+    Each query is run warmup times untimed, then timed runs times with tracemalloc off;
+    memory is measured in a separate pass, one traced run per query, so tracing never
+    inflates the timings. Latency percentiles and variance are reported per query and
+    over all runs, together with the peak traced memory of each query and of the suite.
+    Repeated runs see the state the KB keeps across queries (solver engines, result cache),
+    as in a long-running screening process.
+    """
+    print(f"\n=== Measuring {solver_name} ({warmup} warm-up + {runs} timed runs per query) ===")
+    queries = []
+    all_samples = []
+    passed_tests = 0
+
+    for conditions, expected in test_cases:
+        query = [expected]
+        for _ in range(warmup):
+            solver(kb, query, assumptions=conditions)
+
+        samples = []
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            result = solver(kb, query, assumptions=conditions)
+            samples.append((time.perf_counter() - start_time) * 1000)
+        all_samples.extend(samples)
+        if result == True:
+            passed_tests += 1
+
+        queries.append({'conditions': list(conditions), 'query': query, 'result': result, **latency_stats(samples)})
+        print(f"Query: {query}, Conditions: {conditions}, Result: {result}, p50: {queries[-1]['p50_ms']:.4f} ms")
+
+    # Counter pass
+    samples = []
+    for entry, _ in zip(queries, solve_counted(kb, test_cases, solver, samples)):
+        entry['counters'] = samples[-1]
+
+    # Memory pass
+    suite_peak = 0
+    for entry, (conditions, expected) in zip(queries, test_cases):
+        tracemalloc.start()
+        solver(kb, [expected], assumptions=conditions)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        entry['peak_memory_kb'] = round(peak / 1024, 2)
+        suite_peak = max(suite_peak, peak)
+
+    log[solver_name] = {
+        'total_tests': len(test_cases),
+        'passed_tests': passed_tests,
+        'performance_metrics': {**latency_stats(all_samples), 'peak_memory_kb': round(suite_peak / 1024, 2)},
+        'counters': combine(samples),
+        'queries': queries
+    }
+    print(f"\nAll measurements completed for {solver_name}!")
+
+def run_test_suite(kb, test_cases, solver, solver_name, log, file_name, processes=None, measure=False):
+    """
+    Run a suite of tests with given solver and test cases.
+    kb is compiled once and shared by every test; the conditions of a test are
+    passed to the solver as assumptions instead of being added to a copy of the KB.
+    If processes is given, the tests are answered by solve_batch on that many worker
+    processes and the time of each test is the wait for its result. Otherwise the solver
+    counters of every test are collected and their aggregate is logged under 'counters'.
+    With measure=True the suite is run by measure_test_suite instead, for timings
+    that can be compared between solvers.
+    """
+    if measure:
+        if processes is not None:
+            raise ValueError("Measured runs are serial; processes cannot be combined with measure")
+        return measure_test_suite(kb, test_cases, solver, solver_name, log)
 
-def run_test_suite(kb, test_cases, solver, solver_name, log, file_name):
-    """Run a suite of tests with given solver and test cases"""
     print(f"\n=== Running Tests with {solver_name} ===")
     log[solver_name] = {
         'total_tests': len(test_cases),
@@ -24,24 +125,25 @@ def run_test_suite(kb, test_cases, solver, solver_name, log, file_name):
     total_memory = 0
     peak_memory = 0
 
+    samples = []
+    if processes is not None:
+        results = solve_batch(kb, test_cases, solver, processes)
+    else:
+        results = solve_counted(kb, test_cases, solver, samples)
+
     for conditions, expected in test_cases:
         print(f"\nTesting conditions: {conditions}")
 
-        # Create a local KB for each test
-        test_kb = kb.copy()
-        for fact in conditions:
-            test_kb.append([fact])
-
         # Execute test
         start_time = time.perf_counter()
         query = [expected]
-        result = solver(test_kb, query)
+        result = next(results)
         end_time = time.perf_counter()
 
         # Calculate metrics
         execution_time = (end_time - start_time) * 1000
         current_memory, current_peak = tracemalloc.get_traced_memory()
-        peak_memory = max(current_memory, current_peak)
+        peak_memory = max(peak_memory, current_peak)
 
         current_memory_mb = current_memory / 1024
         total_time += execution_time
@@ -62,26 +164,67 @@ def run_test_suite(kb, test_cases, solver, solver_name, log, file_name):
         'peak_memory_kb': round(peak_memory / 1024, 2)
     })
 
+    if processes is None:
+        log[solver_name]['counters'] = combine(samples)
+
     tracemalloc.stop()
     print(f"\nAll tests completed for {solver_name}!")
 
-def main():
-    log = {}
-    # Step 1: Load input by file
-    data_dir = "data"
-    covid_files = [f for f in os.listdir(data_dir) if f.startswith('covid') and f.endswith('.txt')]
-    for file_name in covid_files:
-        file_path = os.path.join(data_dir, file_name)
-        print(f"\n=== Processing file: {file_path} ===")
+def profile_test(kb, test_case, solver, solver_name, log, directory=os.path.join('output', 'profiles')):
+    """
+    Profile a single test with cProfile. The raw profile and its report are saved as
+    <directory>/<solver_name>.pstats and .txt, and the totals are logged under 'profile'.
+    """
+    conditions, expected = test_case
+    path = os.path.join(directory, solver_name.replace(' ', '_'))
+    result, summary = profile_query(solver, kb, [expected], conditions, path=path + '.pstats')
+    with open(path + '.txt', 'w') as f:
+        f.write(summary.pop('report'))
+    log.setdefault(solver_name, {})['profile'] = {
+        'conditions': list(conditions),
+        'query': [expected],
+        'result': result,
+        **summary,
+        'stats_file': path + '.pstats'
+    }
+    print(f"Profiled {solver_name}: {summary['total_calls']} calls, {summary['total_time_ms']:.2f} ms -> {path}.txt")
 
-        # Step 2: Process input into logical expressions
-        logical_expressions = convert_to_logical_format(file_path)
+def classify_test_cases(kb, test_cases, labels, log, methods=CLASSIFIERS):
+    """
+    Classify the conditions of every test against all labels at once with each method,
+    logging the labels found, whether they include the expected one, and the latency.
+    """
+    print(f"\n=== Classifying into {', '.join(labels)} ===")
+    log['classification'] = {'labels': list(labels)}
+    for method in methods:
+        cases = []
+        samples = []
+        for conditions, expected in test_cases:
+            start_time = time.perf_counter()
+            entailed = classify(kb, conditions, labels, method)
+            samples.append((time.perf_counter() - start_time) * 1000)
+            cases.append({'conditions': list(conditions), 'expected': expected, 'labels': entailed})
+        passed = sum(case['expected'] in case['labels'] for case in cases)
+        log['classification'][method] = {
+            'total_tests': len(test_cases),
+            'passed_tests': passed,
+            'performance_metrics': latency_stats(samples),
+            'cases': cases
+        }
+        print(f"{method}: {passed}/{len(test_cases)} expected labels found, p50: {percentile(samples, 50):.4f} ms")
 
-        # Step 3: Convert expressions to CNF
-        kb = []
-        for expression in logical_expressions:
-            cnf_clause = convert_to_cnf_list(expression)  # Convert each logical rule to CNF
-            kb.extend(cnf_clause)  # Add CNF clauses to KB
+def main(measure=False, profile=False):
+    log = {}
+    # Steps 1-3: Stream every rule file into one KB (lines -> logical expressions -> CNF clauses),
+    # or map the compiled KB cached by an earlier run on the same files
+    rule_files = list(iter_rule_files(os.path.join("data", "covid*.txt")))
+    for file_path in rule_files:
+        print(f"\n=== Processing file: {file_path} ===")
+    kb, stats = preprocess(load_kb_cached(rule_files))
+    print(f"Preprocessing: {stats['clauses_before']} -> {stats['clauses_after']} clauses, "
+          f"{stats['literals_before']} -> {stats['literals_after']} literals")
+    log['preprocessing'] = stats
+    file_name = ", ".join(os.path.basename(path) for path in rule_files)
 
     # Step 4: Define test cases based on the **5 simplified rules**
     test_cases = [
@@ -124,14 +267,19 @@ def main():
     ]
 
     # Step 5: Run both test suites with both solvers
-    for solver_name, solver in [("Unoptimized Solve", solve), ("Optimized Solve", solve_opt)]:
-        run_test_suite(kb, test_cases, solver, f"{solver_name}_Dataset_1", log, file_name)
-        run_test_suite(kb, test_cases_2, solver, f"{solver_name}_Dataset_2", log, file_name)
+    for solver_name, solver in [("Unoptimized Solve", solve), ("Optimized Solve", solve_opt), ("SAT Solve", solve_sat), ("Forward Chaining", solve_forward), ("Tabled Solve", solve_tabled)]:
+        run_test_suite(kb, test_cases, solver, f"{solver_name}_Dataset_1", log, file_name, measure=measure)
+        run_test_suite(kb, test_cases_2, solver, f"{solver_name}_Dataset_2", log, file_name, measure=measure)
+        if profile:
+            profile_test(kb, test_cases[0], solver, f"{solver_name}_Dataset_1", log)
+
+    # Step 6: Decide every label of the rule files for each test in one pass
+    classify_test_cases(kb, test_cases_2, rule_conclusions(rule_files), log)
 
-    # Step 6: Save results
+    # Step 7: Save results
     os.makedirs('output', exist_ok=True)
     with open(f'output/results_log.yml', 'w') as f:
         yaml.dump(log, f, default_flow_style=False)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(measure="--measure" in sys.argv, profile="--profile" in sys.argv)
\ No newline at end of file
@@ -0,0 +1,99 @@
+from knowledge_base import compile_kb
+
+try:
+    import numpy as np
+except ImportError:  # The batch check falls back to Python ints
+    np = None
+
+
+def literal_bit(literal):
+    """Bit of an encoded literal in a literal mask: 2v for v, 2v + 1 for ¬v."""
+    return 2 * literal if literal > 0 else -2 * literal + 1
+
+
+class ClauseMasks:
+    """
+    The clauses of a KnowledgeBase as bitsets over literals, for checking assignments
+    with a few integer operations per clause instead of a dict lookup per literal.
+
+    An assignment becomes the mask of the literals it falsifies: bit(v) is set when ¬v
+    is true and bit(¬v) when v is true. A clause is falsified exactly when all of its
+    literal bits are in that mask, that is when mask & clause == clause.
+    """
+
+    def __init__(self, kb):
+        kb = compile_kb(kb)
+        self.num_bits = 2 * len(kb.symbols) + 2
+        self.masks = []
+        for clause in kb.encoded_clauses():
+            mask = 0
+            for literal in clause:
+                mask |= 1 << literal_bit(literal)
+            self.masks.append(mask)
+        self._matrix = None
+
+    def falsified_mask(self, assignment):
+        """
+        Mask of the literals an assignment over encoded literals falsifies; literals
+        mapped to a false value are ignored, as in verify_solution().
+        """
+        mask = 0
+        for literal, value in assignment.items():
+            if value:
+                mask |= 1 << literal_bit(-literal)
+        return mask
+
+    def falsified_clause(self, falsified):
+        """Return the id of the first clause whose literals are all falsified, or None."""
+        for clause_id, mask in enumerate(self.masks):
+            if falsified & mask == mask:
+                return clause_id
+        return None
+
+    def consistent(self, assignment):
+        """True if the assignment falsifies no clause."""
+        return self.falsified_clause(self.falsified_mask(assignment)) is None
+
+    def consistent_batch(self, assignments):
+        """
+        Check many assignments at once; returns a list of booleans like consistent().
+        With NumPy, the clause masks and the assignments become boolean matrices and a
+        clause is falsified when its count of unfalsified literals, a matrix product, is 0.
+        """
+        falsified = [self.falsified_mask(assignment) for assignment in assignments]
+        if np is None or not falsified or not self.masks:
+            return [self.falsified_clause(mask) is None for mask in falsified]
+
+        if self._matrix is None:
+            self._matrix = self._to_matrix(self.masks)
+        open_literals = ~self._to_matrix(falsified)
+        unfalsified_counts = open_literals.astype(np.int32) @ self._matrix.T.astype(np.int32)
+        return (unfalsified_counts > 0).all(axis=1).tolist()
+
+    def _to_matrix(self, masks):
+        bytes_per_row = (self.num_bits + 7) // 8
+        data = b"".join(mask.to_bytes(bytes_per_row, "little") for mask in masks)
+        rows = np.frombuffer(data, dtype=np.uint8).reshape(len(masks), bytes_per_row)
+        return np.unpackbits(rows, axis=1, bitorder="little")[:, :self.num_bits].astype(bool)
+
+
+def clause_masks(kb):
+    """Return the ClauseMasks of a KB, built once per compiled KB."""
+    return compile_kb(kb).engine('masks', ClauseMasks)
+
+
+def verify_batch(kb, assignments):
+    """
+    verify_solution() for many assignments over literal strings at once.
+    """
+    kb = compile_kb(kb)
+    lookup = kb.symbols.lookup
+    encoded = []
+    for assignment in assignments:
+        encoded_assignment = {}
+        for literal, value in assignment.items():
+            literal = lookup(literal)
+            if literal is not None:
+                encoded_assignment[literal] = value
+        encoded.append(encoded_assignment)
+    return clause_masks(kb).consistent_batch(encoded)
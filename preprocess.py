@@ -0,0 +1,131 @@
+from knowledge_base import KnowledgeBase, compile_kb
+
+
+def _canonical_clauses(kb, stats):
+    """
+    Sort and deduplicate the literals of every clause, drop tautologies, and drop
+    repeated clauses, keeping the first occurrence of each in KB order.
+    """
+    clauses = {}
+    for clause in kb.encoded_clauses():
+        literals = set(clause)
+        if any(-literal in literals for literal in literals):
+            stats['tautologies'] += 1
+            continue
+        key = tuple(sorted(literals, key=abs))
+        if key in clauses:
+            stats['duplicates'] += 1
+        else:
+            clauses[key] = None
+    return [list(clause) for clause in clauses]
+
+
+def _propagate_units(clauses, stats):
+    """
+    Propagate unit clauses: clauses containing a true literal are removed (the unit
+    itself is kept), and false literals are removed from the rest. Returns the clauses
+    that remain, in order; an empty clause among them means the KB is inconsistent.
+    """
+    occurrences = {}
+    for clause_id, clause in enumerate(clauses):
+        for literal in clause:
+            occurrences.setdefault(literal, []).append(clause_id)
+
+    alive = [True] * len(clauses)
+    units = {}  # true literal -> id of the unit clause kept for it
+    queue = [clause_id for clause_id, clause in enumerate(clauses) if len(clause) == 1]
+    while queue:
+        clause_id = queue.pop()
+        if not alive[clause_id] or len(clauses[clause_id]) != 1:
+            continue
+        unit = clauses[clause_id][0]
+        if unit in units:
+            continue
+        units[unit] = clause_id
+
+        for other in occurrences.get(unit, ()):
+            if other != clause_id and alive[other]:
+                alive[other] = False
+                stats['satisfied'] += 1
+        for other in occurrences.get(-unit, ()):
+            if alive[other]:
+                clauses[other] = [literal for literal in clauses[other] if literal != -unit]
+                stats['literals_removed'] += 1
+                if len(clauses[other]) == 1:
+                    queue.append(other)
+                elif not clauses[other]:
+                    stats['consistent'] = False
+    return [clause for clause, keep in zip(clauses, alive) if keep]
+
+
+def _remove_subsumed(clauses, stats):
+    """
+    Remove every clause that is a superset of another clause, shortest clauses first.
+    """
+    occurrences = {}  # literal -> kept clauses (as sets) containing it
+    subsumed = set()
+    for clause_id in sorted(range(len(clauses)), key=lambda i: len(clauses[i])):
+        literals = set(clauses[clause_id])
+        if any(kept <= literals for literal in literals for kept in occurrences.get(literal, ())):
+            subsumed.add(clause_id)
+            continue
+        for literal in literals:
+            occurrences.setdefault(literal, []).append(literals)
+    stats['subsumed'] += len(subsumed)
+    return [clause for clause_id, clause in enumerate(clauses) if clause_id not in subsumed]
+
+
+def _eliminate_pure_literals(clauses, protected, stats):
+    """
+    Repeatedly remove the clauses containing a pure literal, one whose complement occurs
+    in no clause, unless its symbol is protected.
+    """
+    while True:
+        present = {literal for clause in clauses for literal in clause}
+        pure = {literal for literal in present if -literal not in present and abs(literal) not in protected}
+        if not pure:
+            return clauses
+        remaining = [clause for clause in clauses if not pure.intersection(clause)]
+        stats['pure_eliminated'] += len(clauses) - len(remaining)
+        clauses = remaining
+
+
+def preprocess(kb, pure_literals=False, protected=()):
+    """
+    Simplify a KB after CNF conversion: canonicalize and deduplicate clauses, propagate
+    unit facts, and remove subsumed clauses. The result is logically equivalent to kb,
+    so every query and assumption is answered as before.
+
+    pure_literals=True also removes the clauses of pure literals. That only preserves
+    satisfiability: a query or assumption on an eliminated symbol may no longer be
+    entailed, so every symbol that may be queried or assumed must be listed in protected.
+
+    Returns (new KnowledgeBase sharing kb's symbol table, stats) where stats counts what
+    each step removed and the clause and literal totals before and after.
+    """
+    kb = compile_kb(kb)
+    stats = {
+        'clauses_before': len(kb),
+        'literals_before': len(kb.literals),
+        'tautologies': 0,
+        'duplicates': 0,
+        'satisfied': 0,
+        'literals_removed': 0,
+        'subsumed': 0,
+        'pure_eliminated': 0,
+        'consistent': True
+    }
+
+    clauses = _canonical_clauses(kb, stats)
+    clauses = _propagate_units(clauses, stats)
+    clauses = _remove_subsumed(clauses, stats)
+    if pure_literals:
+        protected_ids = {kb.symbols.ids[name] for name in protected if name in kb.symbols.ids}
+        clauses = _eliminate_pure_literals(clauses, protected_ids, stats)
+
+    result = KnowledgeBase(symbols=kb.symbols)
+    for clause in clauses:
+        result.add_encoded_clause(clause)
+    stats['clauses_after'] = len(result)
+    stats['literals_after'] = len(result.literals)
+    return result, stats
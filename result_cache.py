@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+RESULT_CACHE_SIZE = 100_000  # entries kept per KB by default
+
+# Key under which solve_opt counts, in its cache, the goal sets cut off as cycles and the
+# proofs rejected by verify_solution; failures found under such an event depend on the
+# path and the assignment that led to them, and are not cached
+PATH_DEPENDENT = None
+
+
+class ResultCache:
+    """
+    Bounded least-recently-used map from (goal set, assumptions) to the result of
+    proving that goal set, shared by every query against one compiled KB.
+    hits, misses and evictions count lookups and dropped entries.
+    """
+
+    def __init__(self, maxsize=RESULT_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        value = self.entries.get(key, default)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class QueryCache(dict):
+    """
+    The cache of one solve_opt() query: a dict of goal set -> result that falls back
+    to a ResultCache for goal sets it has not seen, keyed together with the query's
+    assumptions so queries with different facts never share results.
+    """
+
+    def __init__(self, shared, assumptions):
+        super().__init__()
+        self.shared = shared
+        self.assumptions = assumptions
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        if key is PATH_DEPENDENT:
+            return False
+        value = self.shared.get((key, self.assumptions))
+        if value is None:
+            return False
+        self[key] = value
+        return True
+
+    def commit(self):
+        """
+        Store this query's results in the shared cache. solve_opt() only caches failures
+        that do not depend on the search path, so every result can be shared.
+        """
+        for key, value in self.items():
+            if key is not PATH_DEPENDENT:
+                self.shared.put((key, self.assumptions), value)
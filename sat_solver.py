@@ -0,0 +1,358 @@
+import heapq
+from knowledge_base import compile_kb
+from instrumentation import counters
+
+TRUE, UNASSIGNED, FALSE = 1, 0, -1
+
+RESTART_BASE = 100  # conflicts per unit of the Luby restart sequence
+ACTIVITY_DECAY = 0.95
+
+
+def luby(i):
+    """
+    i-th element (1-based) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, ...
+    """
+    size, power = 1, 1
+    while size < i:
+        power *= 2
+        size = 2 * size + 1
+    while size != i:
+        size //= 2
+        power //= 2
+        if i > size:
+            i -= size
+    return power
+
+
+class SatSolver:
+    """
+    CDCL SAT solver over the integer-encoded clauses of a KnowledgeBase.
+
+    Unit propagation uses two watched literals per clause, conflicts are
+    analysed to the first unique implication point and the learned clause is
+    kept, decisions follow VSIDS activity with phase saving, and the search
+    restarts on the Luby schedule.
+
+    solve() takes a list of assumption literals that are decided first, so one
+    solver (and everything it has learned) can answer many queries: learned
+    clauses only depend on the clauses of the KB, never on the assumptions.
+    """
+
+    def __init__(self, kb):
+        kb = compile_kb(kb)
+        self.clauses = []
+        self.watches = {}  # literal -> ids of the clauses watching it
+        self.values = [UNASSIGNED]
+        self.levels = [0]
+        self.reasons = [None]  # var -> id of the clause that implied it
+        self.activity = [0.0]
+        self.phases = [FALSE]
+        self.heap = []  # (-activity, var), possibly with stale entries
+        self.activity_increment = 1.0
+        self.trail = []
+        self.trail_limits = []  # trail length at the start of each decision level
+        self.propagation_head = 0
+        self.ok = True  # False once the clauses are unsatisfiable on their own
+        self.extra_vars = {}  # symbol unknown to the KB -> variable of this solver
+        self.stats = {'solves': 0, 'decisions': 0, 'propagations': 0, 'conflicts': 0, 'learned': 0}
+
+        for _ in range(len(kb.symbols)):
+            self.new_var()
+        for clause in kb.encoded_clauses():
+            self.add_clause(clause)
+
+    # Variables and values
+
+    def new_var(self):
+        """Add a variable that occurs in no clause yet and return its id."""
+        var = len(self.values)
+        self.values.append(UNASSIGNED)
+        self.levels.append(0)
+        self.reasons.append(None)
+        self.activity.append(0.0)
+        self.phases.append(FALSE)
+        heapq.heappush(self.heap, (0.0, var))
+        return var
+
+    def value(self, literal):
+        value = self.values[abs(literal)]
+        return value if literal > 0 else -value
+
+    def decision_level(self):
+        return len(self.trail_limits)
+
+    def _enqueue(self, literal, reason):
+        var = abs(literal)
+        self.values[var] = TRUE if literal > 0 else FALSE
+        self.levels[var] = self.decision_level()
+        self.reasons[var] = reason
+        self.trail.append(literal)
+
+    def _backtrack(self, level):
+        if self.decision_level() <= level:
+            return
+        limit = self.trail_limits[level]
+        for literal in self.trail[limit:]:
+            var = abs(literal)
+            self.phases[var] = self.values[var]
+            self.values[var] = UNASSIGNED
+            self.reasons[var] = None
+            heapq.heappush(self.heap, (-self.activity[var], var))
+        del self.trail[limit:]
+        del self.trail_limits[level:]
+        self.propagation_head = len(self.trail)
+
+    # Clauses
+
+    def add_clause(self, clause):
+        """
+        Add a clause at decision level 0. Returns False if the clauses became unsatisfiable.
+        """
+        if not self.ok:
+            return False
+        self._backtrack(0)
+
+        literals = []
+        for literal in dict.fromkeys(clause):
+            if -literal in literals or self.value(literal) == TRUE:
+                return True  # Tautology or already satisfied
+            if self.value(literal) != FALSE:
+                literals.append(literal)
+
+        if not literals:
+            self.ok = False
+        elif len(literals) == 1:
+            self._enqueue(literals[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._attach(literals)
+        return self.ok
+
+    def _attach(self, literals):
+        clause_id = len(self.clauses)
+        self.clauses.append(literals)
+        self.watches.setdefault(literals[0], []).append(clause_id)
+        self.watches.setdefault(literals[1], []).append(clause_id)
+        return clause_id
+
+    # Propagation and conflict analysis
+
+    def _propagate(self):
+        """
+        Unit propagation with two watched literals. Returns a conflicting clause id or None.
+        """
+        clauses, watches, values = self.clauses, self.watches, self.values
+        start = self.propagation_head
+        while self.propagation_head < len(self.trail):
+            false_literal = -self.trail[self.propagation_head]
+            self.propagation_head += 1
+            watchers = watches.get(false_literal)
+            if not watchers:
+                continue
+
+            i = j = 0
+            while i < len(watchers):
+                clause_id = watchers[i]
+                i += 1
+                clause = clauses[clause_id]
+
+                # Keep the false literal in position 1
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], false_literal
+                first = clause[0]
+                first_value = values[abs(first)] if first > 0 else -values[abs(first)]
+                if first_value == TRUE:
+                    watchers[j] = clause_id
+                    j += 1
+                    continue
+
+                # Look for a new literal to watch
+                for k in range(2, len(clause)):
+                    literal = clause[k]
+                    if (values[abs(literal)] if literal > 0 else -values[abs(literal)]) != FALSE:
+                        clause[1], clause[k] = literal, false_literal
+                        watches.setdefault(literal, []).append(clause_id)
+                        break
+                else:
+                    watchers[j] = clause_id
+                    j += 1
+                    if first_value == FALSE:
+                        # Conflict: keep the remaining watchers and stop
+                        while i < len(watchers):
+                            watchers[j] = watchers[i]
+                            i += 1
+                            j += 1
+                        del watchers[j:]
+                        self.stats['propagations'] += self.propagation_head - start
+                        return clause_id
+                    self._enqueue(first, clause_id)
+
+            del watchers[j:]
+        self.stats['propagations'] += self.propagation_head - start
+        return None
+
+    def _bump(self, var):
+        self.activity[var] += self.activity_increment
+        if self.activity[var] > 1e100:
+            # Rescale every activity to avoid overflow
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.activity_increment *= 1e-100
+            self.heap = [(-self.activity[v], v) for v in range(1, len(self.values))
+                         if self.values[v] == UNASSIGNED]
+            heapq.heapify(self.heap)
+        heapq.heappush(self.heap, (-self.activity[var], var))
+
+    def _analyze(self, conflict):
+        """
+        First-UIP conflict analysis. Returns the learned clause (asserting literal
+        first, then the literal of the highest remaining level) and the level to
+        backjump to.
+        """
+        seen = set()
+        learnt = [None]
+        pending = 0  # literals of the current level still to be resolved away
+        index = len(self.trail) - 1
+        literal = None
+        clause = self.clauses[conflict]
+        current_level = self.decision_level()
+
+        while True:
+            for other in (clause if literal is None else clause[1:]):
+                var = abs(other)
+                if var not in seen and self.levels[var] > 0:
+                    seen.add(var)
+                    self._bump(var)
+                    if self.levels[var] == current_level:
+                        pending += 1
+                    else:
+                        learnt.append(other)
+
+            # Next literal of the current level on the trail
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.clauses[self.reasons[abs(literal)]]
+
+        learnt[0] = -literal
+        self.activity_increment /= ACTIVITY_DECAY
+
+        if len(learnt) == 1:
+            return learnt, 0
+        highest = max(range(1, len(learnt)), key=lambda k: self.levels[abs(learnt[k])])
+        learnt[1], learnt[highest] = learnt[highest], learnt[1]
+        return learnt, self.levels[abs(learnt[1])]
+
+    def _pick_branch_literal(self):
+        while self.heap:
+            negative_activity, var = heapq.heappop(self.heap)
+            if self.values[var] == UNASSIGNED and -negative_activity == self.activity[var]:
+                return var if self.phases[var] == TRUE else -var
+        return None
+
+    # Search
+
+    def solve(self, assumptions=()):
+        """
+        Decide whether the clauses are satisfiable with every assumption literal true.
+        """
+        if not self.ok:
+            return False
+        self.stats['solves'] += 1
+        self._backtrack(0)
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+
+        restarts = 1
+        conflicts_until_restart = luby(restarts) * RESTART_BASE
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.stats['conflicts'] += 1
+                if self.decision_level() == 0:
+                    self.ok = False
+                    return False
+                learnt, level = self._analyze(conflict)
+                self._backtrack(level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._enqueue(learnt[0], self._attach(learnt))
+                    self.stats['learned'] += 1
+
+                conflicts_until_restart -= 1
+                if conflicts_until_restart == 0:
+                    self._backtrack(0)
+                    restarts += 1
+                    conflicts_until_restart = luby(restarts) * RESTART_BASE
+                continue
+
+            if self.decision_level() < len(assumptions):
+                assumption = assumptions[self.decision_level()]
+                assumption_value = self.value(assumption)
+                if assumption_value == FALSE:
+                    return False  # The assumptions contradict the clauses
+                self.trail_limits.append(len(self.trail))
+                if assumption_value == UNASSIGNED:
+                    self._enqueue(assumption, None)
+                continue
+
+            literal = self._pick_branch_literal()
+            if literal is None:
+                return True  # Every variable is assigned: a model was found
+            self.stats['decisions'] += 1
+            self.trail_limits.append(len(self.trail))
+            self._enqueue(literal, None)
+
+    def entails(self, goals):
+        """
+        Decide whether the clauses entail every encoded goal literal, by showing that
+        the clauses together with the negation of each goal are unsatisfiable.
+        """
+        for goal in goals:
+            if self.solve([-goal]):
+                return False
+        return True
+
+    def encode_goal(self, symbols, literal):
+        """
+        Encode a goal literal without interning it into the KB's symbol table; a symbol
+        the KB does not know becomes a fresh variable of this solver.
+        """
+        encoded = symbols.lookup(literal)
+        if encoded is None:
+            negated = literal.startswith("¬")
+            name = literal[1:] if negated else literal
+            if name not in self.extra_vars:
+                self.extra_vars[name] = self.new_var()
+            var = self.extra_vars[name]
+            encoded = -var if negated else var
+        return encoded
+
+
+def solve_sat(kb, query, assumptions=()):
+    """
+    Entailment check KB ∧ assumptions ⊨ query with a CDCL SAT solver.
+    The query is a conjunction of literals; it is entailed when KB ∧ assumptions ∧ ¬q
+    is unsatisfiable for every literal q in it. Unlike SLD resolution this is
+    complete for arbitrary (non-Horn) clauses.
+    A compiled KnowledgeBase keeps its solver, and the clauses it learned, across calls.
+    """
+    kb = compile_kb(kb)
+    solver = kb.engine('sat', SatSolver)
+    if counters.enabled:
+        before = dict(solver.stats)
+    encoded_assumptions = [solver.encode_goal(kb.symbols, literal) for literal in assumptions]
+    entailed = True
+    for literal in query:
+        goal = solver.encode_goal(kb.symbols, literal)
+        if solver.solve(encoded_assumptions + [-goal]):
+            entailed = False
+            break
+    if counters.enabled:
+        counters.add(**{name: count - before[name] for name, count in solver.stats.items()})
+    return entailed
@@ -0,0 +1,155 @@
+import argparse, asyncio, collections, json, time
+
+from backward_chaining import solve_opt
+from sat_solver import solve_sat
+from forward_chaining import solve_forward
+from tabling import solve_tabled
+from ingest import load_kb_cached
+from preprocess import preprocess
+from utils import percentile
+
+SOLVERS = {"sld": solve_opt, "sat": solve_sat, "forward": solve_forward, "tabled": solve_tabled}
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BATCH = 64
+MAX_DELAY = 0.002  # seconds a batch waits for more requests after the first one
+LATENCY_WINDOW = 10_000  # most recent requests the latency percentiles are taken over
+
+
+class ScreeningServer:
+    """
+    Serves (facts, goal) screening requests over JSON lines on a local TCP socket.
+
+    The KB is compiled once when the server is created. Requests from all connections
+    go into one queue; a batcher takes whatever arrived within MAX_DELAY of the first
+    waiting request (at most MAX_BATCH), answers repeated requests once, and solves the
+    batch off the event loop so connections keep being served meanwhile.
+
+    Each request is a line like {"id": 1, "facts": ["S02"], "goal": "L01"} and gets a
+    line {"id": 1, "result": true}; a line {"stats": true} gets the counters of stats().
+    """
+
+    def __init__(self, kb, solver=solve_sat, max_batch=MAX_BATCH, max_delay=MAX_DELAY):
+        self.kb = kb
+        self.solver = solver
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = None
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.batches = 0
+        self.latencies_ms = collections.deque(maxlen=LATENCY_WINDOW)
+
+    async def start(self, host=HOST, port=DEFAULT_PORT):
+        """Start listening and batching; returns the asyncio server."""
+        self.queue = asyncio.Queue()
+        self.started = time.perf_counter()
+        self._batcher = asyncio.create_task(self._run_batches())
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def screen(self, facts, goal):
+        """Queue one request and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((tuple(facts), goal, future, time.perf_counter()))
+        return await future
+
+    def stats(self):
+        """Request, batch, throughput and latency counters."""
+        elapsed = time.perf_counter() - self.started
+        latencies = list(self.latencies_ms)
+        stats = {
+            'requests': self.requests,
+            'batches': self.batches,
+            'avg_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'throughput_rps': self.requests / elapsed if elapsed > 0 else 0.0,
+            'queued': self.queue.qsize() if self.queue is not None else 0
+        }
+        if latencies:
+            stats.update({
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99),
+                'max_ms': max(latencies)
+            })
+        return stats
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            queries = list(dict.fromkeys((facts, goal) for facts, goal, _, _ in batch))
+            try:
+                results = await loop.run_in_executor(None, self._solve_all, queries)
+            except Exception as error:
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            finished = time.perf_counter()
+            self.batches += 1
+            for facts, goal, future, arrived in batch:
+                self.requests += 1
+                self.latencies_ms.append((finished - arrived) * 1000)
+                if not future.done():
+                    future.set_result(results[facts, goal])
+
+    def _solve_all(self, queries):
+        return {(facts, goal): self.solver(self.kb, [goal], assumptions=facts) for facts, goal in queries}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                response = await self._respond(line)
+                writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, line):
+        try:
+            request = json.loads(line)
+            if request.get("stats"):
+                return self.stats()
+            facts, goal = request.get("facts", []), request["goal"]
+            if not isinstance(goal, str) or not all(isinstance(fact, str) for fact in facts):
+                raise ValueError("facts must be a list of literals and goal a literal")
+            result = await self.screen(facts, goal)
+            return {"id": request.get("id"), "result": result}
+        except (ValueError, KeyError, AttributeError, TypeError) as error:
+            return {"error": f"Bad request: {error}"}
+
+
+async def serve(patterns, port=DEFAULT_PORT, solver="sat"):
+    kb, _ = preprocess(load_kb_cached(patterns))
+    server = ScreeningServer(kb, SOLVERS[solver])
+    listener = await server.start(HOST, port)
+    print(f"Screening {len(kb)} clauses on {HOST}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve screening requests over JSON lines on localhost.")
+    parser.add_argument("--rules", nargs="+", default=["data/covid*.txt"])
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default="sat")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.rules, args.port, args.solver))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from knowledge_base import compile_kb
+from backward_chaining import _encode_query, _has_contradiction
+from result_cache import ResultCache
+from instrumentation import counters
+
+TABLE_SETS = 1024  # assumption sets whose tables a KB keeps
+
+
+class Tables:
+    """
+    Tabled (SLG-style) resolution over one KB and one set of assumptions.
+
+    Goals are tabled one literal at a time. Calling a goal L explores every clause that
+    resolves it: a clause (L ∨ m1 ∨ ... ∨ mk) proves L once ¬m1 ... ¬mk are all proved,
+    and each ¬mi is called in turn. A call to a goal that is still being evaluated is not
+    failed, as solve_opt() does with cycles; the clause waits on it as a consumer and is
+    resumed when the goal gets its answer. When no call is left to explore, the answers
+    have reached their fixpoint and every goal without one is complete and false.
+
+    Each clause is explored once and each of its literals resumed at most once, so a
+    query costs time linear in the clauses reachable from it, cycles included. Tables
+    are kept across queries, so later calls reuse every completed goal.
+    """
+
+    def __init__(self, kb, assumptions):
+        self.kb = kb
+        self.assumptions = assumptions
+        self.proved = set()
+        self.called = set()
+        self.waiting = {}  # goal -> [premises still unproved, conclusion] of the clauses waiting on it
+        self.resolution_steps = 0  # clauses explored
+
+    def prove(self, goal):
+        """Complete the table of goal and return its answer."""
+        if goal not in self.called:
+            self._evaluate(goal)
+        return goal in self.proved
+
+    def _evaluate(self, goal):
+        literals, offsets = self.kb.literals, self.kb.offsets
+        calls = [goal]
+        self.called.add(goal)
+        while calls:
+            head = calls.pop()
+            if head in self.assumptions:
+                self._answer(head)
+                continue
+
+            for clause_id in self.kb.clause_ids(head):
+                self.resolution_steps += 1
+                premises = {-literals[i] for i in range(offsets[clause_id], offsets[clause_id + 1])
+                            if literals[i] != head}
+                if not premises:
+                    self._answer(head)  # A unit clause
+                    continue
+
+                waiter = [0, head]
+                for premise in premises:
+                    if premise in self.proved:
+                        continue  # A completed answer is reused
+                    waiter[0] += 1
+                    self.waiting.setdefault(premise, []).append(waiter)
+                    if premise not in self.called:
+                        self.called.add(premise)
+                        calls.append(premise)
+                if waiter[0] == 0:
+                    self._answer(head)
+
+    def _answer(self, goal):
+        """Record a proved goal and resume, transitively, the clauses waiting on it."""
+        answers = [goal]
+        while answers:
+            goal = answers.pop()
+            if goal in self.proved:
+                continue
+            self.proved.add(goal)
+            for waiter in self.waiting.pop(goal, ()):
+                waiter[0] -= 1
+                if waiter[0] == 0 and waiter[1] not in self.proved:
+                    answers.append(waiter[1])
+
+
+def tables_of(kb, assumptions):
+    """Return the Tables a compiled KB keeps for an encoded assumption set."""
+    cache = kb.engine('tables', lambda kb: ResultCache(maxsize=TABLE_SETS))
+    tables = cache.get(assumptions)
+    if tables is None:
+        tables = Tables(kb, assumptions)
+        cache.put(assumptions, tables)
+    return tables
+
+
+def solve_tabled(kb, query, assumptions=()):
+    """
+    Backward chaining with tabling, with the same signature as solve(). The query (a
+    conjunction of literals) holds when every literal is proved; answers are complete
+    and do not depend on the order of the search.
+    """
+    kb = compile_kb(kb)
+    encoded = _encode_query(kb, query, assumptions)
+    if encoded is None:
+        return False
+    goals, assumptions = encoded
+    if _has_contradiction(set(goals)):
+        return False
+
+    tables = tables_of(kb, assumptions)
+    if not counters.enabled:
+        return all(tables.prove(goal) for goal in goals)
+
+    before = len(tables.called), len(tables.proved), tables.resolution_steps
+    result = all(tables.prove(goal) for goal in goals)
+    counters.add(goals_called=len(tables.called) - before[0], answers=len(tables.proved) - before[1],
+                 resolution_steps=tables.resolution_steps - before[2])
+    return result
@@ -0,0 +1,22 @@
+import pickle
+from batch import solve_batch
+from knowledge_base import KnowledgeBase
+from sat_solver import solve_sat
+
+
+def test_batch_results_arrive_in_order():
+    kb = KnowledgeBase([['¬S02', 'L01'], ['¬S05', '¬S12', 'L02']])
+    cases = [(['S02'], 'L01'), (['S05'], 'L02'), (['S05', 'S12'], 'L02'), ([], 'L01')] * 10
+
+    assert list(solve_batch(kb, cases, processes=2, chunksize=3)) == [True, False, True, False] * 10
+    assert list(solve_batch(kb, cases[:4], solver=solve_sat, processes=2)) == [True, False, True, False]
+
+
+def test_engines_are_not_pickled():
+    kb = KnowledgeBase([['¬A', 'B']])
+    assert solve_sat(kb, ['B'], assumptions=['A']) is True
+    assert kb.engines
+
+    copy = pickle.loads(pickle.dumps(kb))
+    assert copy.engines == {}
+    assert list(copy) == [['¬A', 'B']]
@@ -0,0 +1,15 @@
+from benchmark import benchmarks, compare
+
+
+def test_benchmarks_run_and_solve_their_workload():
+    for name, function in benchmarks(5):
+        result = function()
+        if name.startswith("solve"):
+            assert result is True, name
+
+
+def test_compare_flags_slowdowns_over_threshold():
+    baseline = {"solve[10]": 1.0, "tokenize[10]": 1.0, "parse_formula[10]": 1.0}
+    results = {"solve[10]": 1.6, "tokenize[10]": 1.4, "compile_kb[10]": 9.0}
+
+    assert compare(results, baseline, threshold=1.5) == [("solve[10]", 1.0, 1.6)]
@@ -0,0 +1,42 @@
+import pytest
+from knowledge_base import KnowledgeBase
+from ingest import rule_conclusions
+from classify import classify, CLASSIFIERS
+from sat_solver import solve_sat
+
+
+def test_rule_conclusions(tmp_path):
+    path = tmp_path / "rules.txt"
+    path.write_text("S01 THEN L02\nS02 AND S03 THEN L01\n\nS04 THEN L02\nmalformed line\n")
+    assert rule_conclusions(str(path)) == ['L02', 'L01']
+
+
+def test_every_method_returns_the_entailed_labels():
+    kb = KnowledgeBase([['¬S02', 'L01'], ['¬S04', 'L02'], ['¬S02', '¬S10', 'L03'], ['¬L02', '¬L01']])
+    labels = ['L01', 'L02', 'L03', 'L04']
+    for method in CLASSIFIERS:
+        assert classify(kb, ['S02'], labels, method) == ['L01']
+        assert classify(kb, ['S02', 'S10'], labels, method) == ['L01', 'L03']
+        assert classify(kb, [], labels, method) == []
+        assert classify(kb, ['L04'], labels, method) == ['L04']
+
+    # Facts contradicting the KB entail every label for the complete methods, as with
+    # solve_forward and solve_sat; resolution only proves the labels it can reach
+    for method in ('forward', 'sat'):
+        assert classify(kb, ['S02', 'S04'], labels, method) == labels
+    for method in ('tabled', 'sld'):
+        assert classify(kb, ['S02', 'S04'], labels, method) == ['L01', 'L02']
+
+
+def test_sat_classification_matches_solve_sat():
+    # Non-Horn: L01 follows from either case of (S01 ∨ S02)
+    kb = KnowledgeBase([['S01', 'S02'], ['¬S01', 'L01'], ['¬S02', 'L01'], ['¬S02', 'L02']])
+    labels = ['L01', 'L02', '¬L02', 'S01']
+    expected = [label for label in labels if solve_sat(kb, [label])]
+    assert classify(kb, [], labels, 'sat') == expected == ['L01']
+    assert classify(kb, ['¬S01'], labels, 'sat') == ['L01', 'L02']
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        classify([['A']], [], ['A'], method='guess')
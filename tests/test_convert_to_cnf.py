@@ -1,4 +1,7 @@
-from convert_to_cnf import convert_to_cnf_list
+from itertools import product
+import pytest
+from logic_node import LogicNode
+from convert_to_cnf import convert_to_cnf_list, parse_formula, eliminate_implications
 
 def test_run():
     # Test run
@@ -33,5 +36,82 @@ def test_run():
             print(f"Meaning: {' AND '.join(clauses)}")
         print()
 
+def evaluate(node, model):
+    if node.type == 'var':
+        return model[node.value]
+    if node.type == 'not':
+        return not evaluate(node.left, model)
+    left, right = evaluate(node.left, model), evaluate(node.right, model)
+    return {
+        'and': left and right,
+        'or': left or right,
+        'implies': not left or right,
+        'equiv': left == right
+    }[node.type]
+
+
+def satisfies(cnf_list, model):
+    return all(
+        any(not model[lit[1:]] if lit.startswith('¬') else model[lit] for lit in clause)
+        for clause in cnf_list
+    )
+
+
+def test_equisatisfiable_mode():
+    formula = "((p equiv q) equiv (q equiv r)) equiv (S02 or S03 and S04)"
+    cnf_list = convert_to_cnf_list(formula, mode='equisatisfiable')
+
+    # Linear size: at most four clauses per connective plus the root
+    assert len(cnf_list) <= 4 * 6 + 1
+
+    tree = parse_formula(formula)
+    originals = ['p', 'q', 'r', 'S02', 'S03', 'S04']
+    auxiliaries = sorted({lit.lstrip('¬') for clause in cnf_list for lit in clause} - set(originals))
+    for values in product([False, True], repeat=len(originals)):
+        model = dict(zip(originals, values))
+        extendable = any(
+            satisfies(cnf_list, {**model, **dict(zip(auxiliaries, aux_values))})
+            for aux_values in product([False, True], repeat=len(auxiliaries))
+        )
+        assert extendable == evaluate(tree, model), model
+
+def test_auxiliary_names_are_fresh_and_reproducible():
+    # The formula's own _T1 must not be reused as an auxiliary variable
+    cnf_list = convert_to_cnf_list("not _T1 and (_T1 or p)", mode='equisatisfiable')
+    assert ['¬_T1'] in cnf_list
+    assert any('_T1' in clause and 'p' in clause for clause in cnf_list)
+
+    formula = "(p or q) and r"
+    assert convert_to_cnf_list(formula, mode='equisatisfiable') == convert_to_cnf_list(formula, mode='equisatisfiable')
+
+
+def test_nodes_are_hash_consed():
+    tree = parse_formula("(p and q) equiv (p and q)")
+    assert tree.left is tree.right
+    assert parse_formula("p and q") is tree.left
+
+    with pytest.raises(AttributeError):
+        tree.left = None
+
+    # Equal values of different types are different variables
+    assert LogicNode('var', 1) is not LogicNode('var', True)
+
+    # P and Q are shared between both halves of the eliminated equivalence
+    eliminated = eliminate_implications(parse_formula("(a or b) equiv c"))
+    assert eliminated.left.left.left is eliminated.right.right
+    assert eliminated.left.right is eliminated.right.left.left
+
+def test_deeply_nested_formulas():
+    depth = 20000  # Far beyond the default recursion limit
+    formula = "(" * depth + "p0" + "".join(f" and p{i})" for i in range(1, depth + 1))
+    assert convert_to_cnf_list(formula) == [[f"p{i}"] for i in range(depth + 1)]
+
+    formula = "".join(f"(p{i} implies " for i in range(depth)) + "q" + ")" * depth
+    cnf_list = convert_to_cnf_list(formula)
+    assert len(cnf_list) == 1 and sorted(cnf_list[0]) == sorted(["q"] + [f"¬p{i}" for i in range(depth)])
+
+    cnf_list = convert_to_cnf_list("not " * depth + "(p and not q)")
+    assert cnf_list == [['p'], ['¬q']]
+
 if __name__ == "__main__":
     test_run()
\ No newline at end of file
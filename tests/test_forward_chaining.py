@@ -0,0 +1,28 @@
+from forward_chaining import HornRules, load_horn_rules, solve_forward
+
+def test_covid_rules():
+    rules = load_horn_rules("data/covid_extended_rules_2.txt")
+    assert rules.non_horn == 1  # S02 AND NOT S04 THEN L01
+
+    entailed, consistent = rules.entailed(["S05", "S12"])
+    assert consistent
+    assert "L02" in entailed and "L01" not in entailed
+
+    entailed, _ = rules.entailed(["S13", "S14"])
+    assert {"L02", "L03"} <= entailed
+
+
+def test_solve_forward_and_constraints():
+    kb = [['¬X', 'Y'], ['¬Y', 'Z'], ['X']]
+    assert solve_forward(kb, ['Z']) is True
+    assert solve_forward(kb, ['W']) is False
+
+    # A fired constraint means the facts contradict the KB
+    derived, consistent = HornRules([['¬A', '¬B'], ['A'], ['B']]).derive()
+    assert not consistent
+
+
+def test_long_chain():
+    length = 50000
+    kb = [[f'¬P{i}', f'P{i + 1}'] for i in range(length)] + [['P0']]
+    assert solve_forward(kb, [f'P{length}']) is True
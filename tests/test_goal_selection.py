@@ -0,0 +1,33 @@
+import pytest
+from knowledge_base import KnowledgeBase
+from backward_chaining import solve, solve_opt
+from goal_selection import fail_first, most_constrained, priority, selection_strategy
+
+
+def test_strategies_pick_goals():
+    kb = KnowledgeBase([['¬B', 'A'], ['¬C', 'A'], ['B'], ['¬A', 'C']])
+    a, b, c = (kb.symbols.lookup(name) for name in 'ABC')
+    goals = tuple(sorted((a, b, c)))
+
+    assert fail_first(kb, goals, frozenset()) == b
+    assert fail_first(kb, goals, frozenset({b})) == c  # The assumption adds an alternative for B
+    assert most_constrained(kb, goals, frozenset()) == a
+    assert priority({'C': 2, 'B': 1})(kb, goals, frozenset()) == c
+    assert priority({})(kb, goals, frozenset()) == goals[0]
+
+
+def test_strategies_give_the_same_answers():
+    kb = KnowledgeBase([['¬B', '¬C', 'A'], ['¬D', 'B'], ['C'], ['D'], ['¬E', 'F']])
+    queries = [(['A'], True), (['A', 'C', 'D'], True), (['A', 'F'], False), (['F', 'B'], False)]
+    for select in (None, 'first', 'fail_first', 'most_constrained', priority({'F': 1})):
+        for solver in (solve, solve_opt):
+            for query, expected in queries:
+                assert solver(kb, query, select=select) is expected
+        assert solve_opt(kb, ['F', 'A'], select=select, assumptions=['E']) is True
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        selection_strategy('random')
+    with pytest.raises(ValueError):
+        solve_opt([['A']], ['A'], select='random')
@@ -0,0 +1,81 @@
+import pytest
+from ingest import iter_rule_files, iter_expressions, load_kb
+from knowledge_base import KnowledgeBase
+from backward_chaining import solve
+
+
+def write_rules(directory, name, lines):
+    path = directory / name
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_load_kb_merges_every_file(tmp_path):
+    write_rules(tmp_path, "rules_1.txt", ["S02 THEN L01", "", "malformed line"])
+    write_rules(tmp_path, "rules_2.txt", ["S05 AND S12 THEN L02"])
+
+    kb = load_kb(str(tmp_path / "rules_*.txt"))
+    assert len(kb) == 2
+    assert solve(kb, ['L01'], assumptions=['S02']) is True
+    assert solve(kb, ['L02'], assumptions=['S05', 'S12']) is True
+
+
+def test_expressions_are_streamed_lazily(tmp_path):
+    path = write_rules(tmp_path, "rules.txt", ["S01 THEN L02"])
+    expressions = iter_expressions([path, path])  # Repeated files are read once
+    assert next(expressions) == "(S01) implies L02"
+    assert next(expressions, None) is None
+
+
+def test_load_kb_extends_a_given_kb(tmp_path):
+    path = write_rules(tmp_path, "rules.txt", ["S01 THEN L02"])
+    kb = KnowledgeBase([['S01']])
+    assert load_kb(path, kb) is kb
+    assert solve(kb, ['L02']) is True
+
+
+def test_unmatched_glob_is_an_error(tmp_path):
+    with pytest.raises(ValueError):
+        list(iter_rule_files(str(tmp_path / "missing_*.txt")))
+
+
+def test_compiled_kb_cache_is_reused_and_invalidated(tmp_path, monkeypatch):
+    import ingest
+    from ingest import load_kb_cached
+
+    path = write_rules(tmp_path, "rules.txt", ["S02 THEN L01", "S05 AND S12 THEN L02"])
+    cache_dir = str(tmp_path / "cache")
+    built = load_kb_cached(path, cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("rules were parsed again")
+
+    monkeypatch.setattr(ingest, "load_kb", fail)
+    cached = load_kb_cached(path, cache_dir)
+    assert list(cached) == list(built)
+    assert solve(cached, ['L02'], assumptions=['S05', 'S12']) is True
+    cached.add_clause(['S02'])  # A mapped KB can still grow
+    assert solve(cached, ['L01']) is True
+
+    monkeypatch.undo()
+    write_rules(tmp_path, "rules.txt", ["S01 THEN L02"])
+    rebuilt = load_kb_cached(path, cache_dir)
+    assert [sorted(clause) for clause in rebuilt] == [['L02', '¬S01']]
+
+
+def test_compiled_kb_file_round_trip(tmp_path):
+    import pickle
+    from knowledge_base import read_kb, write_kb
+
+    kb = KnowledgeBase([['¬B', '¬C', 'A'], ['¬D', 'B'], ['C'], ['D', 'D']])
+    write_kb(kb, str(tmp_path / "kb.kb"))
+    loaded = read_kb(str(tmp_path / "kb.kb"))
+
+    assert list(loaded) == list(kb)
+    assert list(loaded.clause_ids(loaded.symbols.lookup('¬D'))) == [1]
+    assert list(loaded.clause_ids(loaded.symbols.lookup('D'))) == [3]
+    assert list(pickle.loads(pickle.dumps(loaded))) == list(kb)
+
+    (tmp_path / "bad.kb").write_bytes(b"not a kb file at all, just some bytes")
+    with pytest.raises(ValueError):
+        read_kb(str(tmp_path / "bad.kb"))
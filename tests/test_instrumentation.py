@@ -0,0 +1,68 @@
+from knowledge_base import KnowledgeBase
+from backward_chaining import solve, solve_opt
+from sat_solver import solve_sat
+from forward_chaining import solve_forward
+from tabling import solve_tabled
+from instrumentation import counters, counting, combine, profile_query
+
+
+def test_sld_counters():
+    kb = KnowledgeBase([['¬B', 'A'], ['¬C', 'B'], ['C'], ['¬A', 'A']])
+    with counting() as counts:
+        assert solve(kb, ['A']) is True
+    assert counts['resolution_steps'] >= 3
+    assert counts['max_depth'] == 3
+    assert counts['verify_calls'] == 3
+    assert counts['cache_hits'] == counts['cache_misses'] == 0
+
+    with counting() as counts:
+        assert solve_opt(kb, ['A'], cache={}) is True
+    assert counts['cache_misses'] > 0
+
+    cache = {}
+    solve_opt(kb, ['A'], cache=cache)
+    with counting() as counts:
+        assert solve_opt(kb, ['A'], cache=cache) is True
+    assert counts['cache_hits'] == 1 and counts['resolution_steps'] == 0
+
+    with counting() as counts:
+        assert solve_opt(KnowledgeBase([['¬B', 'A'], ['¬A', 'B']]), ['A'], cache={}) is False
+    assert counts['cycle_cutoffs'] == 1
+
+
+def test_every_solver_counts():
+    kb = KnowledgeBase([['¬S', 'L'], ['¬L', 'M']])
+    for solver in (solve, solve_opt, solve_sat, solve_forward, solve_tabled):
+        with counting() as counts:
+            assert solver(kb, ['M'], assumptions=['S']) is True
+        assert counts and all(count >= 0 for count in counts.values())
+
+
+def test_counting_is_off_by_default_and_nests():
+    kb = KnowledgeBase([['¬S', 'L']])
+    assert not counters.enabled
+    solve(kb, ['L'], assumptions=['S'])
+    assert counters.values == {}
+
+    with counting() as outer:
+        solve(kb, ['L'], assumptions=['S'])
+        with counting() as inner:
+            solve(kb, ['L'], assumptions=['S'])
+    assert outer['resolution_steps'] == 2 * inner['resolution_steps']
+    assert outer['max_depth'] == inner['max_depth']
+    assert not counters.enabled
+
+
+def test_combine_sums_and_takes_maxima():
+    assert combine([{'resolution_steps': 2, 'max_depth': 3}, {'resolution_steps': 1, 'max_depth': 5}]) == \
+        {'resolution_steps': 3, 'max_depth': 5}
+
+
+def test_profile_query(tmp_path):
+    kb = KnowledgeBase([['¬S', 'L']])
+    path = tmp_path / 'profile.pstats'
+    result, summary = profile_query(solve_opt, kb, ['L'], ['S'], path=str(path))
+    assert result is True
+    assert summary['total_calls'] > 0
+    assert '_search' in summary['report']
+    assert path.exists()
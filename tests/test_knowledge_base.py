@@ -0,0 +1,130 @@
+import sys
+from knowledge_base import KnowledgeBase, SymbolTable
+from convert_to_cnf import convert_to_cnf_list
+from backward_chaining import solve, solve_opt
+from benchmark import rule_chain
+
+def test_index_lists_matching_clauses():
+    kb = KnowledgeBase([
+        ['¬B', '¬C', 'A'],
+        ['¬D', 'B'],
+        ['C'],
+        ['D', 'D']
+    ])
+
+    def clauses_with(literal):
+        encoded = kb.symbols.lookup(literal)
+        return [kb.symbols.decode_clause(kb.clause(clause_id)) for clause_id in kb.clause_ids(encoded)]
+
+    assert clauses_with('B') == [['¬D', 'B']]
+    assert clauses_with('¬B') == [['¬B', '¬C', 'A']]
+    assert clauses_with('D') == [['D', 'D']]  # Indexed once per clause
+    assert clauses_with('E') == []
+    assert list(kb) == [['¬B', '¬C', 'A'], ['¬D', 'B'], ['C'], ['D', 'D']]
+
+
+def test_literals_are_signed_symbol_ids():
+    symbols = SymbolTable()
+    encoded = symbols.encode_clause(['¬S04', 'L02', 'S04'])
+
+    assert encoded[0] == -encoded[2]
+    assert symbols.decode_clause(encoded) == ['¬S04', 'L02', 'S04']
+    assert convert_to_cnf_list("S04 implies L02", symbols) in ([[-encoded[2], encoded[1]]], [[encoded[1], -encoded[2]]])
+
+
+def test_solvers_accept_compiled_kb():
+    kb = KnowledgeBase([
+        ['¬X', 'Y'],
+        ['¬Y', 'Z'],
+        ['X']
+    ])
+
+    for solver in (solve, solve_opt):
+        assert solver(kb, ['Z']) is True
+        assert solver(kb, ['W']) is False
+    assert kb.symbols.lookup('W') is None  # Queries never intern new symbols
+
+
+def test_contradictory_goals_are_not_proved():
+    # p=F, s=T, q=F and Z=F, A=T, B=F are models, so neither query is entailed
+    for kb, query in [
+        ([['q', '¬p', '¬s'], ['s', 'p']], ['q']),
+        ([['Z', 'A', 'B'], ['¬B', '¬A']], ['Z'])
+    ]:
+        for solver in (solve, solve_opt):
+            assert solver(kb, query) is False
+
+
+def test_caller_assignment_is_read_and_updated():
+    kb = KnowledgeBase([['¬X', 'Y'], ['¬Y', '¬Z'], ['X']])
+
+    for solver in (solve, solve_opt):
+        assignment = {'Z': True}  # Y would falsify (¬Y ∨ ¬Z)
+        assert solver(kb, ['Y'], assignment=assignment) is False
+
+        assignment = {}
+        assert solver(kb, ['Y'], assignment=assignment) is True
+        assert assignment['Y'] is True
+
+
+def test_deep_chains_do_not_recurse():
+    size = sys.getrecursionlimit() + 200
+    kb = KnowledgeBase(rule_chain(size))
+    for solver in (solve, solve_opt):
+        assert solver(kb, [f'L{size - 1:03d}'], assumptions=['S000']) is True
+        assert solver(kb, [f'L{size - 1:03d}']) is False
+
+
+def test_backtracking_undoes_the_assignment():
+    # ¬X3 is first tried through ¬X1, a dead end whose X3 must not stay set
+    # when the proof through X1 is verified
+    kb = KnowledgeBase([['X1', '¬X3'], ['¬X1', '¬X3'], ['X0', 'X3'], ['X1']])
+    for solver in (solve, solve_opt):
+        assignment = {}
+        assert solver(kb, ['X0'], assignment=assignment) is True
+        assert assignment == {'X0': True, '¬X3': True, 'X1': True}
+
+        assignment = {}
+        assert solver(kb, ['Q'], assignment=assignment) is False
+        assert assignment == {}
+
+
+def test_assumptions_act_as_unit_clauses():
+    from sat_solver import solve_sat
+    from forward_chaining import solve_forward
+
+    kb = KnowledgeBase([['¬S02', 'L01'], ['¬S05', '¬S12', 'L02'], ['¬S04', '¬L01']])
+
+    for solver in (solve, solve_opt, solve_sat, solve_forward):
+        assert solver(kb, ['L01'], assumptions=['S02']) is True
+        assert solver(kb, ['L02'], assumptions=['S05', 'S12']) is True
+        assert solver(kb, ['L02'], assumptions=['S05']) is False
+        assert solver(kb, ['L01']) is False  # Assumptions never stay in the KB
+        assert solver(kb, ['X'], assumptions=['X']) is True
+    assert len(kb) == 3
+    assert kb.symbols.lookup('X') is None
+
+
+def test_result_cache_spans_queries():
+    from backward_chaining import result_cache_of
+    from result_cache import ResultCache
+
+    kb = KnowledgeBase([['¬S02', 'L01'], ['¬L01', 'L04'], ['¬S05', 'L04']])
+    assert solve_opt(kb, ['L04'], assumptions=['S02']) is True
+    cache = result_cache_of(kb)
+    assert cache.hits == 0 and len(cache) > 0
+
+    assert solve_opt(kb, ['L04'], assumptions=['S02']) is True
+    assert cache.hits == 1
+    assert solve_opt(kb, ['L04'], assumptions=['S03']) is False  # Other facts, other entries
+    assert solve_opt(kb, ['L04'], assumptions=['S05']) is True
+    assert cache.stats()['hits'] == 1
+
+    kb.add_clause(['S03'])
+    assert result_cache_of(kb) is not cache  # Stale results are discarded with the KB change
+
+    small = ResultCache(maxsize=2)
+    for key in range(5):
+        small.put(key, True)
+    assert len(small) == 2 and small.evictions == 3
+    assert small.get(0) is None and small.get(4) is True
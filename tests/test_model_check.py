@@ -0,0 +1,35 @@
+import pytest
+import model_check
+from model_check import ClauseMasks, verify_batch
+from knowledge_base import KnowledgeBase
+from backward_chaining import verify_solution
+
+KB = [['¬S02', 'L01'], ['¬S05', '¬S12', 'L02'], ['¬L01', '¬L02']]
+ASSIGNMENTS = [
+    {},
+    {'S02': True, 'L01': True},
+    {'L01': True, 'L02': True},          # Falsifies (¬L01 ∨ ¬L02)
+    {'S05': True, 'S12': True, '¬L02': True},  # Falsifies (¬S05 ∨ ¬S12 ∨ L02)
+    {'S05': True, 'S12': False, '¬L02': True},
+]
+EXPECTED = [True, True, False, False, True]
+
+
+def test_masks_agree_with_clause_scan():
+    kb = KnowledgeBase(KB)
+    masks = ClauseMasks(kb)
+    for assignment, expected in zip(ASSIGNMENTS, EXPECTED):
+        encoded = {kb.symbols.lookup(literal): value for literal, value in assignment.items()}
+        assert verify_solution(KB, assignment) is expected
+        assert verify_solution(kb, encoded) is expected
+        assert masks.consistent(encoded) is expected
+
+
+def test_batch_without_numpy(monkeypatch):
+    monkeypatch.setattr(model_check, "np", None)
+    assert verify_batch(KnowledgeBase(KB), ASSIGNMENTS) == EXPECTED
+
+
+def test_batch_with_numpy():
+    pytest.importorskip("numpy")
+    assert verify_batch(KnowledgeBase(KB), ASSIGNMENTS) == EXPECTED
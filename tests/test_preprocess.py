@@ -0,0 +1,40 @@
+from knowledge_base import KnowledgeBase
+from preprocess import preprocess
+from backward_chaining import solve
+from sat_solver import solve_sat
+
+
+def canonical(kb):
+    return sorted(sorted(clause) for clause in kb)
+
+
+def test_duplicates_subsumed_and_satisfied_clauses_are_removed():
+    kb = KnowledgeBase([
+        ['¬S02', 'L01'],
+        ['L01', '¬S02'],         # Duplicate in another order
+        ['¬S02', '¬S03', 'L01'], # Subsumed by the first clause
+        ['S07', '¬S07'],         # Tautology
+        ['S09'],
+        ['S09', 'L03'],          # Satisfied by the unit S09
+        ['¬S09', 'S10', 'L04']   # ¬S09 is false
+    ])
+    simplified, stats = preprocess(kb)
+
+    assert canonical(simplified) == [['L01', '¬S02'], ['L04', 'S10'], ['S09']]
+    assert stats['duplicates'] == 1 and stats['subsumed'] == 1 and stats['tautologies'] == 1
+    assert stats['satisfied'] == 1 and stats['literals_removed'] == 1
+    assert (stats['clauses_before'], stats['clauses_after']) == (7, 3)
+    assert solve(simplified, ['L01'], assumptions=['S02']) is True
+
+
+def test_conflicting_units_are_reported():
+    _, stats = preprocess([['A'], ['¬A', 'B'], ['¬B']])
+    assert stats['consistent'] is False
+
+
+def test_pure_literals_respect_protected_symbols():
+    kb = [['¬S02', 'L01'], ['¬S02', 'X']]
+    simplified, stats = preprocess(kb, pure_literals=True, protected=['S02', 'L01'])
+    assert canonical(simplified) == [['L01', '¬S02']]
+    assert stats['pure_eliminated'] == 1
+    assert solve_sat(simplified, ['L01'], assumptions=['S02']) is True
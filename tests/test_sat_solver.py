@@ -0,0 +1,43 @@
+from knowledge_base import KnowledgeBase
+from sat_solver import SatSolver, solve_sat, luby
+
+def test_entailment_matches_backward_chaining_cases():
+    kb = [['¬B', '¬C', 'A'], ['¬D', 'B'], ['C'], ['D']]
+    assert solve_sat(kb, ['A']) is True
+    assert solve_sat(kb, ['A', 'B']) is True
+    assert solve_sat(kb, ['E']) is False  # Unknown symbol
+
+    kb = [['q', '¬p', '¬s'], ['s', 'p']]
+    assert solve_sat(kb, ['q']) is False
+
+
+def test_non_horn_entailment():
+    # (p ∨ q), (¬p ∨ r), (¬q ∨ r) entail r, which SLD resolution cannot prove
+    assert solve_sat([['p', 'q'], ['¬p', 'r'], ['¬q', 'r']], ['r']) is True
+
+
+def test_pigeonhole_is_unsatisfiable():
+    pigeons, holes = 6, 5
+    var = lambda p, h: f"x{p}_{h}"
+    clauses = [[var(p, h) for h in range(holes)] for p in range(pigeons)]
+    for h in range(holes):
+        for p in range(pigeons):
+            for other in range(p + 1, pigeons):
+                clauses.append([f"¬{var(p, h)}", f"¬{var(other, h)}"])
+
+    solver = SatSolver(KnowledgeBase(clauses))
+    assert solver.solve() is False
+    assert len(solver.clauses) > len(clauses)  # Conflicts produced learned clauses
+
+
+def test_assumptions_reuse_one_solver():
+    kb = KnowledgeBase([['¬S02', 'L01'], ['¬S04', 'L02'], ['¬L01', '¬L02']])
+    solver = SatSolver(kb)
+    encode = kb.symbols.lookup
+    assert solver.solve([encode('S02')]) is True
+    assert solver.solve([encode('S02'), encode('S04')]) is False
+    assert solver.solve([encode('S04')]) is True
+
+
+def test_luby_sequence():
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
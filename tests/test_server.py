@@ -0,0 +1,40 @@
+import asyncio
+import json
+from knowledge_base import KnowledgeBase
+from server import ScreeningServer
+
+
+async def exchange(port, requests):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for request in requests:
+        writer.write((json.dumps(request) + "\n").encode("utf-8"))
+    await writer.drain()
+    responses = [json.loads(await reader.readline()) for _ in requests]
+    writer.close()
+    return responses
+
+
+def test_concurrent_requests_are_batched():
+    kb = KnowledgeBase([['¬S02', 'L01'], ['¬S05', '¬S12', 'L02']])
+
+    async def run():
+        server = ScreeningServer(kb, max_delay=0.05)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            clients = [
+                exchange(port, [{"id": i, "facts": ["S02"], "goal": "L01"},
+                                {"id": i, "facts": ["S05"], "goal": "L02"}])
+                for i in range(10)
+            ]
+            answers = await asyncio.gather(*clients)
+            stats, error = await exchange(port, [{"stats": True}, {"facts": ["S02"]}])
+        return answers, stats, error
+
+    answers, stats, error = asyncio.run(run())
+    for i, (first, second) in enumerate(answers):
+        assert first == {"id": i, "result": True}
+        assert second == {"id": i, "result": False}
+    assert stats['requests'] == 20
+    assert stats['batches'] < 20 and stats['p99_ms'] >= stats['p50_ms']
+    assert "error" in error
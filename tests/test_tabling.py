@@ -0,0 +1,39 @@
+import time
+from knowledge_base import KnowledgeBase
+from backward_chaining import solve_opt
+from tabling import solve_tabled
+
+
+def test_goals_in_progress_are_not_failed():
+    # Proving A through (¬B ∨ A) calls B, whose only proof goes back through A or C
+    kb = KnowledgeBase([['¬B', 'A'], ['¬A', 'B'], ['¬C', 'B'], ['C']])
+    assert solve_tabled(kb, ['A']) is True
+    assert solve_tabled(kb, ['B']) is True
+
+    kb = KnowledgeBase([['¬B', 'A'], ['¬A', 'B']])
+    assert solve_tabled(kb, ['A']) is False
+    assert solve_tabled(kb, ['A'], assumptions=['B']) is True
+    assert solve_tabled(kb, ['A']) is False  # Tables are kept per assumption set
+
+
+def test_answers_do_not_depend_on_search_order():
+    # X0 <- ¬X3 <- X1, where ¬X3 <- ¬X1 is a dead end
+    kb = [['X1', '¬X3'], ['¬X1', '¬X3'], ['X0', 'X3'], ['X1']]
+    assert solve_tabled(kb, ['X0']) is True
+    assert solve_tabled(kb, ['X0', '¬X0']) is False
+
+
+def test_cyclic_rule_base_is_polynomial():
+    size = 2000
+    kb = KnowledgeBase([[f'¬X{i}', f'X{(i + 1) % size}'] for i in range(size)])
+    start = time.perf_counter()
+    assert solve_tabled(kb, [f'X{size - 1}']) is False
+    assert solve_tabled(kb, [f'X{size - 1}'], assumptions=['X0']) is True
+    assert time.perf_counter() - start < 2
+
+
+def test_failures_from_cycle_cutoffs_are_not_cached():
+    kb = KnowledgeBase([['¬B', 'A'], ['¬A', 'B'], ['¬C', 'B'], ['C']])
+    cache = {}
+    assert solve_opt(kb, ['A'], cache=cache) is True
+    assert all(result for key, result in cache.items() if key is not None)
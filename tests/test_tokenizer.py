@@ -0,0 +1,26 @@
+import pytest
+from tokenizer import tokenize, parse_formula
+from convert_to_cnf import convert_to_cnf_list
+
+
+def test_tokens_keep_source_positions():
+    tokens = tokenize("(S02 and not S04)implies L01")
+    assert tokens == ['(', 'S02', 'and', 'not', 'S04', ')', 'implies', 'L01']
+    assert tokens.positions == [0, 1, 5, 9, 13, 16, 17, 25]
+
+
+def test_unicode_connectives_parse_like_keywords():
+    formula = "((p and not q) or r) implies (s equiv p)"
+    tree = parse_formula(formula)
+
+    assert tokenize("¬p∧(q→r)") == ['not', 'p', 'and', '(', 'q', 'implies', 'r', ')']
+    assert parse_formula("((p ∧ ¬q) ∨ r) → (s ↔ p)") is tree
+    assert parse_formula(str(tree)) is tree  # LogicNode.__str__ output reads back
+    assert convert_to_cnf_list("p → q") == convert_to_cnf_list("p implies q")
+
+
+def test_errors_report_source_positions():
+    with pytest.raises(ValueError, match="Unexpected token: \\) at position 6"):
+        parse_formula("p and ) q")
+    with pytest.raises(ValueError, match="Unexpected end of input at position 9"):
+        parse_formula("(p ∧ q) →")
@@ -0,0 +1,36 @@
+from tracing import tracer, configure, OFF, INFO, DEBUG
+from backward_chaining import solve, solve_opt
+from utils import is_tautology
+
+
+def test_disabled_tracer_records_nothing(capsys):
+    configure(level=OFF, stream=None)
+    assert solve([['¬X', 'Y'], ['X']], ['Y']) is True
+    assert is_tautology(['S07', '¬S07']) is True
+    assert tracer.events == []
+    assert capsys.readouterr().out == ''
+
+
+def test_events_describe_each_step():
+    configure(level=DEBUG, stream=None)
+    try:
+        assert solve_opt([['¬X', 'Y'], ['X']], ['Y']) is True
+        events = list(tracer.events)
+    finally:
+        tracer.events.clear()
+        configure(level=OFF, stream=None)
+
+    steps = [event for event in events if event['event'] == 'resolve']
+    assert {'goal': 'Y', 'clause': ['¬X', 'Y'], 'depth': 0, 'outcome': 'proved', 'event': 'resolve'} in steps
+    assert any(event['event'] == 'proved' for event in events)
+
+
+def test_stream_receives_json_lines(tmp_path):
+    path = tmp_path / 'trace.jsonl'
+    with open(path, 'w') as stream:
+        configure(level=INFO, stream=stream, buffer_size=2)
+        solve([['¬A', 'B'], ['¬B', 'A']], ['A'])
+        configure(level=OFF, stream=None)
+    lines = path.read_text().splitlines()
+    assert lines and all(line.startswith('{') for line in lines)
+    assert any('"cycle"' in line for line in lines)
@@ -0,0 +1,38 @@
+import random
+import pytest
+import truth_table
+import generate_propositional_logic
+from truth_table import find_counterexample, fuzz_cnf
+from convert_to_cnf import parse_formula
+
+
+@pytest.fixture(params=["ints", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(truth_table, "np", None)
+    return request.param
+
+
+def test_counterexamples_are_reported(backend):
+    assert find_counterexample("p implies q", [['¬p', 'q']]) is None
+    assert find_counterexample("p implies q", [['p', 'q']]) == {'p': False, 'q': False}
+    assert find_counterexample("C implies ((not C or E) equiv E)", []) is None  # A tautology
+    assert find_counterexample(parse_formula("p and q"), [['p'], ['q'], ['r']]) == {'p': True, 'q': True, 'r': False}
+
+
+def test_chunks_cover_every_assignment(backend):
+    formula = " and ".join(f"(V{i} or not V{i + 1})" for i in range(9))
+    assert find_counterexample(formula, chunk_bits=3) is None
+
+    clauses = [[f"V{i}", f"¬V{i + 1}"] for i in range(9)]
+    clauses[-1] = ["V8"]  # Differs only where V8 and V9 are both false
+    counterexample = find_counterexample(formula, clauses, chunk_bits=3)
+    assert counterexample['V8'] is False and counterexample['V9'] is False
+
+
+def test_generated_formulas_convert_to_equivalent_cnf(backend):
+    random.seed(0)
+    formulas = [generate_propositional_logic.random_expr() for _ in range(300)]
+    assert fuzz_cnf(formulas) == []
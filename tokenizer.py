@@ -1,16 +1,64 @@
+import re
 from logic_node import LogicNode
 
+# Unicode connectives, as printed by LogicNode.__str__, and the keywords they stand for
+OPERATOR_ALIASES = {"¬": "not", "∧": "and", "∨": "or", "→": "implies", "↔": "equiv"}
+
+# A parenthesis, a Unicode connective, or a run of anything else up to whitespace
+TOKEN_PATTERN = re.compile(r"[()¬∧∨→↔]|[^\s()¬∧∨→↔]+")
+UNICODE_OPERATOR_PATTERN = re.compile(r"[¬∧∨→↔]")
+
+
+class Tokens(list):
+    """
+    A list of tokens that also knows where each one starts in the source text.
+    Positions are only needed to report errors, so they are found on first use.
+    """
+
+    def __init__(self, tokens, source):
+        super().__init__(tokens)
+        self.source = source
+        self._positions = None
+
+    @property
+    def positions(self):
+        if self._positions is None:
+            self._positions = [match.start() for match in TOKEN_PATTERN.finditer(self.source)]
+        return self._positions
+
+    def position(self, index):
+        """Source offset of the token at index; the end of the source past the last token."""
+        positions = self.positions
+        return positions[index] if index < len(positions) else len(self.source)
+
+
 def tokenize(formula):
-    """Tokenize a logical formula into a list of tokens."""
-    # Add spaces around parentheses
-    formula = formula.replace("(", " ( ")
-    formula = formula.replace(")", " ) ")
-    
-    # Split by spaces and filter out empty tokens
-    tokens = [token for token in formula.split() if token]
-    # print(tokens) # for debugging
-    
-    return tokens
+    """
+    Tokenize a logical formula into a list of tokens in one regex pass.
+    Connectives may be written as keywords (not, and, or, implies, equiv) or as
+    ¬ ∧ ∨ → ↔; Unicode connectives are returned as their keywords.
+    """
+    if UNICODE_OPERATOR_PATTERN.search(formula):
+        tokens = [OPERATOR_ALIASES.get(token, token) for token in TOKEN_PATTERN.findall(formula)]
+    else:
+        # Same tokens as TOKEN_PATTERN, but str.replace and str.split run faster than the regex
+        tokens = formula.replace("(", " ( ").replace(")", " ) ").split()
+    return Tokens(tokens, formula)
+
+
+def _location(tokens, pos):
+    """Describe where token pos is, if the tokens carry source positions."""
+    if isinstance(tokens, Tokens):
+        return f" at position {tokens.position(pos)}"
+    return ""
+
+
+# Binding strength of each binary connective; higher binds tighter
+BINARY_PRECEDENCE = {"equiv": 0, "implies": 1, "or": 2, "and": 3}
+NOT_PRECEDENCE = 4
+TERM_PRECEDENCE = 5
+
+KEYWORDS = ["and", "or", "implies", "equiv", "not", "(", ")"]
 
 
 def parse_tokens(tokens, pos=0):
@@ -28,78 +76,102 @@ def parse_tokens(tokens, pos=0):
      
      # Start with the lowest precedence: parse_equiv
     return parse_equiv(tokens, pos)
- 
+
+
+def _parse(tokens, pos, precedence):
+    """
+    Operator-precedence parser with an explicit stack.
+
+    Builds the same trees as a recursive-descent parser entered at the given
+    precedence level (all binary connectives are left-associative, NOT binds to
+    the term immediately following it), but without recursing per nesting level.
+    Returns the parsed node and the position of the first unconsumed token.
+    """
+    operands = []
+    operators = []  # binary connectives, "not", or "(" marking an open parenthesis
+    frame_precedence = [precedence]  # lowest connective each open frame may consume
+    variables = {}  # name -> node, so repeated variables skip the intern lookup
+
+    def reduce_binary():
+        right = operands.pop()
+        operands[-1] = LogicNode(operators.pop(), None, operands[-1], right)
+
+    while True:
+        # Expect an operand: any number of NOTs, then a variable or a parenthesis
+        if pos >= len(tokens):
+            raise ValueError(f"Unexpected end of input{_location(tokens, pos)}")
+        
+        token = tokens[pos]
+        if token == "not" and frame_precedence[-1] <= NOT_PRECEDENCE:
+            operators.append("not")
+            pos += 1
+            continue
+        
+        if token == "(":
+            operators.append("(")
+            frame_precedence.append(0)  # Start from the lowest precedence inside parentheses
+            pos += 1
+            continue
+        
+        if token in KEYWORDS:
+            raise ValueError(f"Unexpected token: {token}{_location(tokens, pos)}")
+        
+        node = variables.get(token)
+        if node is None:
+            node = variables[token] = LogicNode("var", token)
+        operands.append(node)
+        pos += 1
+
+        # After an operand: apply pending NOTs, then take a connective or close frames
+        while True:
+            while operators and operators[-1] == "not":
+                operators.pop()
+                operands.append(LogicNode("not", left=operands.pop()))
+            
+            token = tokens[pos] if pos < len(tokens) else None
+            token_precedence = BINARY_PRECEDENCE.get(token)
+            if token_precedence is not None and token_precedence >= frame_precedence[-1]:
+                while operators and BINARY_PRECEDENCE.get(operators[-1], -1) >= token_precedence:
+                    reduce_binary()
+                operators.append(token)
+                pos += 1
+                break
+            
+            # The current frame ends here
+            while operators and operators[-1] in BINARY_PRECEDENCE:
+                reduce_binary()
+            
+            if len(frame_precedence) == 1:
+                return operands.pop(), pos
+            
+            operators.pop()  # The "(" of this frame
+            frame_precedence.pop()
+            pos += 1  # Skip the closing parenthesis
+
+
 def parse_equiv(tokens, pos):
     """Parse equivalence (lowest precedence)"""
-    left, pos = parse_implies(tokens, pos)
-    
-    while pos < len(tokens) and tokens[pos] == "equiv":
-        pos += 1
-        right, pos = parse_implies(tokens, pos)
-        left = LogicNode("equiv", left=left, right=right)
-    
-    return left, pos
+    return _parse(tokens, pos, BINARY_PRECEDENCE["equiv"])
 
 def parse_implies(tokens, pos):
     """Parse implication (second lowest precedence)"""
-    left, pos = parse_or(tokens, pos)
-    
-    while pos < len(tokens) and tokens[pos] == "implies":
-        pos += 1
-        right, pos = parse_or(tokens, pos)
-        left = LogicNode("implies", left=left, right=right)
-    
-    return left, pos
+    return _parse(tokens, pos, BINARY_PRECEDENCE["implies"])
 
 def parse_or(tokens, pos):
     """Parse disjunction"""
-    left, pos = parse_and(tokens, pos)
-    
-    while pos < len(tokens) and tokens[pos] == "or":
-        pos += 1
-        right, pos = parse_and(tokens, pos)
-        left = LogicNode("or", left=left, right=right)
-    
-    return left, pos
+    return _parse(tokens, pos, BINARY_PRECEDENCE["or"])
 
 def parse_and(tokens, pos):
     """Parse conjunction"""
-    left, pos = parse_not(tokens, pos)
-    
-    while pos < len(tokens) and tokens[pos] == "and":
-        pos += 1
-        right, pos = parse_not(tokens, pos)
-        left = LogicNode("and", left=left, right=right)
-    return left, pos
+    return _parse(tokens, pos, BINARY_PRECEDENCE["and"])
 
 def parse_not(tokens, pos):
     """Parse negation"""
-    if pos < len(tokens) and tokens[pos] == "not":
-        pos += 1
-        expr, pos = parse_not(tokens, pos)  # NOT binds to the term immediately following it
-        return LogicNode("not", left=expr), pos
-    
-    return parse_term(tokens, pos)
+    return _parse(tokens, pos, NOT_PRECEDENCE)
 
 def parse_term(tokens, pos):
     """Parse terms (variables or parenthesized expressions)"""
-    if pos >= len(tokens):
-        raise ValueError("Unexpected end of input")
-    
-    token = tokens[pos]
-    
-    # Handle parenthesized expressions
-    if token == "(":
-        pos += 1
-        expr, pos = parse_equiv(tokens, pos)  # Start from the lowest precedence inside parentheses
-        return expr, pos + 1
-
-
-    # Handle variables
-    if token not in ["and", "or", "implies", "equiv", "not", "(", ")"]:
-        return LogicNode("var", token), pos + 1
-    
-    raise ValueError(f"Unexpected token: {token}")
+    return _parse(tokens, pos, TERM_PRECEDENCE)
 
 def parse_formula(formula):
     """
@@ -109,5 +181,5 @@ def parse_formula(formula):
     tree, pos = parse_tokens(tokens)
     
     if pos < len(tokens):
-        raise ValueError(f"Unexpected tokens after parsing: {tokens[pos:]}")
+        raise ValueError(f"Unexpected tokens after parsing: {tokens[pos:]}{_location(tokens, pos)}")
     return tree
\ No newline at end of file
@@ -0,0 +1,52 @@
+import json
+import sys
+
+# Trace levels: INFO reports outcomes (proofs, cycles, tautologies), DEBUG every resolution step
+OFF, INFO, DEBUG = 0, 1, 2
+
+
+class Tracer:
+    """
+    Structured trace events for the solvers, silent unless a level is set.
+
+    Call sites guard every event with `if tracer.level >= LEVEL:`, so a disabled
+    tracer costs one attribute read and comparison, and event fields (decoded
+    goals, clauses) are only built when they will be recorded. Events are dicts
+    kept in a buffer; with a stream they are written to it as JSON lines every
+    buffer_size events and on flush().
+    """
+
+    def __init__(self, level=OFF, stream=None, buffer_size=1024):
+        self.level = level
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.events = []
+
+    def emit(self, event, **fields):
+        fields['event'] = event
+        self.events.append(fields)
+        if self.stream is not None and len(self.events) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered events to the stream, if there is one, and clear the buffer."""
+        if self.stream is None:
+            return
+        self.stream.write(''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in self.events))
+        self.stream.flush()
+        self.events.clear()
+
+
+tracer = Tracer()
+
+
+def configure(level=INFO, stream=sys.stderr, buffer_size=1024):
+    """
+    Set the level, stream and buffer size of the shared tracer; stream=None keeps the
+    events in tracer.events. Events buffered so far are flushed to the previous stream.
+    """
+    tracer.flush()
+    tracer.level = level
+    tracer.stream = stream
+    tracer.buffer_size = buffer_size
+    return tracer
@@ -0,0 +1,161 @@
+from logic_node import LogicNode
+from convert_to_cnf import parse_formula, convert_to_cnf_list, _variable_names
+
+try:
+    import numpy as np
+except ImportError:  # Truth tables fall back to Python ints used as bit vectors
+    np = None
+
+MAX_VARIABLES = 25
+CHUNK_BITS = 16  # each chunk covers 2**CHUNK_BITS assignments
+
+
+def _column_ints(count, width):
+    """
+    Columns of the first count variables over 2**width assignments as Python ints:
+    bit k of column i is bit i of k.
+    """
+    size = 1 << width
+    full = (1 << size) - 1
+    columns = []
+    for i in range(count):
+        half = 1 << i
+        period_mask = (1 << (2 * half)) - 1
+        block = ((1 << half) - 1) << half  # one period: half zeros, then half ones
+        columns.append(full // period_mask * block)
+    return columns, full
+
+
+class _Chunk:
+    """
+    Truth values of every variable over one chunk of assignments: assignments
+    start .. start + size - 1, where bit i of an assignment is variable i.
+    Values are NumPy boolean arrays, or Python ints used as bit vectors.
+    """
+
+    def __init__(self, variables, start, width):
+        self.start = start
+        self.size = 1 << width
+        if np is not None:
+            indices = np.arange(start, start + self.size, dtype=np.int64)
+            self.full = True
+            self.columns = {name: ((indices >> i) & 1).astype(bool) for i, name in enumerate(variables)}
+        else:
+            low, self.full = _column_ints(min(width, len(variables)), width)
+            self.columns = {}
+            for i, name in enumerate(variables):
+                self.columns[name] = low[i] if i < width else (self.full if start >> i & 1 else 0)
+
+    def constant(self, value):
+        if np is not None:
+            return np.full(self.size, value)
+        return self.full if value else 0
+
+    def first_true(self, values):
+        """Offset of the first assignment where values is true, or None."""
+        if np is not None:
+            hits = np.flatnonzero(values)
+            return int(hits[0]) if len(hits) else None
+        return (values & -values).bit_length() - 1 if values else None
+
+
+def evaluate_node(node, chunk):
+    """
+    Evaluate a LogicNode over every assignment of a chunk, bottom-up with an explicit
+    stack. Shared subformulas are evaluated once.
+    """
+    full = chunk.full
+    values = {}
+    stack = [node]
+    while stack:
+        current = stack[-1]
+        if id(current) in values:
+            stack.pop()
+            continue
+        if current.type == 'var':
+            values[id(current)] = chunk.columns[current.value]
+            stack.pop()
+            continue
+        children = [child for child in (current.left, current.right) if child is not None]
+        pending = [child for child in children if id(child) not in values]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+
+        left = values[id(current.left)]
+        if current.type == 'not':
+            values[id(current)] = full ^ left
+            continue
+        right = values[id(current.right)]
+        if current.type == 'and':
+            values[id(current)] = left & right
+        elif current.type == 'or':
+            values[id(current)] = left | right
+        elif current.type == 'implies':
+            values[id(current)] = (full ^ left) | right
+        elif current.type == 'equiv':
+            values[id(current)] = full ^ (left ^ right)
+        else:
+            raise ValueError(f"Unknown node type: {current.type}")
+    return values[id(node)]
+
+
+def evaluate_cnf(clauses, chunk):
+    """Evaluate a list of clauses of literal strings over every assignment of a chunk."""
+    full = chunk.full
+    result = chunk.constant(True)
+    for clause in clauses:
+        satisfied = chunk.constant(False)
+        for literal in clause:
+            if literal.startswith("¬"):
+                satisfied = satisfied | (full ^ chunk.columns[literal[1:]])
+            else:
+                satisfied = satisfied | chunk.columns[literal]
+        result = result & satisfied
+    return result
+
+
+def find_counterexample(formula, clauses=None, chunk_bits=CHUNK_BITS):
+    """
+    Compare a formula (string or LogicNode) with a CNF over all 2**n assignments of
+    their variables, chunk by chunk. For a formula string, clauses defaults to
+    convert_to_cnf_list(formula); a LogicNode must come with its clauses.
+    Returns the first assignment, as a dict of variable -> bool, on which they differ,
+    or None if they are equivalent.
+    """
+    if isinstance(formula, LogicNode):
+        if clauses is None:
+            raise ValueError("A LogicNode needs the clauses to compare it with")
+        node = formula
+    else:
+        node = parse_formula(formula)
+        if clauses is None:
+            clauses = convert_to_cnf_list(formula)
+
+    variables = sorted(_variable_names(node) | {literal.lstrip("¬") for clause in clauses for literal in clause})
+    if len(variables) > MAX_VARIABLES:
+        raise ValueError(f"Too many variables for a truth table: {len(variables)} (at most {MAX_VARIABLES})")
+
+    width = min(chunk_bits, len(variables))
+    for start in range(0, 1 << len(variables), 1 << width):
+        chunk = _Chunk(variables, start, width)
+        difference = evaluate_node(node, chunk) ^ evaluate_cnf(clauses, chunk)
+        offset = chunk.first_true(difference)
+        if offset is not None:
+            assignment = start + offset
+            return {name: bool(assignment >> i & 1) for i, name in enumerate(variables)}
+    return None
+
+
+def fuzz_cnf(formulas):
+    """
+    Check convert_to_cnf_list on many formulas; returns (formula, counterexample) pairs
+    for every formula whose CNF is not equivalent to it.
+    """
+    failures = []
+    for formula in formulas:
+        counterexample = find_counterexample(formula)
+        if counterexample is not None:
+            failures.append((formula, counterexample))
+    return failures
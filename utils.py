@@ -1,28 +1,43 @@
 import re
+from tracing import tracer, DEBUG
 
 def is_tautology(query):
     """
     Detects tautologies from the query.
     Example: If 'S07' and '¬S07' exist, the query is a tautology.
+    Integer-encoded literals are supported too: 7 and -7 form a tautology.
     
     :param query: List of literals.
     :return: boolean
     """
     cleaned_query = set(query)  # Convert list to set for efficient lookups
 
-    for lit in list(cleaned_query):  # Iterate over a copy of the set
-        if lit.startswith("¬"):
-            pos_lit = lit[1:]  # Get the positive version
-            if pos_lit in cleaned_query:
-                print(f"Tautology detected: {lit} or {pos_lit}.")
-                return True
-
-        elif f"¬{lit}" in cleaned_query:
-            print(f"Tautology detected: {lit} or ¬{lit}.")
+    for lit in cleaned_query:
+        neg_lit = negate_literal(lit)
+        if neg_lit in cleaned_query:
+            if tracer.level >= DEBUG:
+                tracer.emit('tautology', literal=lit, complement=neg_lit)
             return True
 
     return False
 
+def percentile(samples, p):
+    """p-th percentile (0-100) of the samples, interpolating linearly between ranks."""
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+def negate_literal(literal):
+    """
+    Returns the complement of a literal: 'S07' becomes '¬S07' and '¬S07' becomes 'S07'.
+    Integer-encoded literals are negated arithmetically.
+    """
+    if isinstance(literal, int):
+        return -literal
+    return literal[1:] if literal.startswith("¬") else f"¬{literal}"
+
 def convert_to_logical_format(file_path):
     """
     Converts a rule file into a logical format using ['and', 'or', 'implies', 'equiv'],
@@ -31,8 +46,24 @@ def convert_to_logical_format(file_path):
     :param file_path: Path to the inference rules file.
     :return: List of formatted logical expressions.
     """
-    logical_expressions = []
-    
+    return list(iter_logical_format(file_path))
+
+def iter_logical_format(file_path):
+    """
+    Like convert_to_logical_format, but yields the expressions one line at a time,
+    so memory does not grow with the size of the file.
+    """
+    with open(file_path, "r") as file:
+        for line in file:
+            expression = line_to_logical_format(line)
+            if expression is not None:
+                yield expression
+
+def line_to_logical_format(line):
+    """
+    Converts one rule line (S.. AND S.. THEN L..) into a logical expression.
+    Returns None for empty and malformed lines.
+    """
     # Define mappings for connectives
     CONNECTIVES = {
         "AND": "and",
@@ -40,60 +71,55 @@ def convert_to_logical_format(file_path):
         "THEN": "implies"
     }
 
-    with open(file_path, "r") as file:
-        for line in file:
-            line = line.strip()
-            if not line:
-                continue  # Skip empty lines
-
-            # Extract parts
-            parts = re.split(r'\s+', line)
-            if "THEN" not in parts:
-                continue  # Skip malformed lines
-
-            then_index = parts.index("THEN")
-            conditions = parts[:then_index]  # Everything before THEN
-            conclusion = parts[then_index + 1]  # The conclusion after THEN
-
-            # Process conditions with correct precedence
-            condition_stack = []
-            i = 0
-            while i < len(conditions):
-                token = conditions[i]
-
-                if token == "NOT":  # Handle negation
-                    i += 1
-                    condition_stack.append(f"not {conditions[i]}")
-                elif token in CONNECTIVES:
-                    condition_stack.append(CONNECTIVES[token])
-                else:
-                    condition_stack.append(token)
-
-                i += 1
-
-            # Ensure OR conditions are grouped with parentheses
-            if "or" in condition_stack:
-                grouped_conditions = []
+    line = line.strip()
+    if not line:
+        return None  # Skip empty lines
+
+    # Extract parts
+    parts = re.split(r'\s+', line)
+    if "THEN" not in parts:
+        return None  # Skip malformed lines
+
+    then_index = parts.index("THEN")
+    conditions = parts[:then_index]  # Everything before THEN
+    conclusion = parts[then_index + 1]  # The conclusion after THEN
+
+    # Process conditions with correct precedence
+    condition_stack = []
+    i = 0
+    while i < len(conditions):
+        token = conditions[i]
+
+        if token == "NOT":  # Handle negation
+            i += 1
+            condition_stack.append(f"not {conditions[i]}")
+        elif token in CONNECTIVES:
+            condition_stack.append(CONNECTIVES[token])
+        else:
+            condition_stack.append(token)
+
+        i += 1
+
+    # Ensure OR conditions are grouped with parentheses
+    if "or" in condition_stack:
+        grouped_conditions = []
+        current_or_group = []
+
+        for term in condition_stack:
+            if term == "or":
+                current_or_group.append(term)
+            elif term == "and" and current_or_group:
+                grouped_conditions.append(f"({' '.join(current_or_group)})")
+                grouped_conditions.append("and")
                 current_or_group = []
-
-                for term in condition_stack:
-                    if term == "or":
-                        current_or_group.append(term)
-                    elif term == "and" and current_or_group:
-                        grouped_conditions.append(f"({' '.join(current_or_group)})")
-                        grouped_conditions.append("and")
-                        current_or_group = []
-                    else:
-                        current_or_group.append(term)
-
-                if current_or_group:
-                    grouped_conditions.append(f"({' '.join(current_or_group)})")
-                final_conditions = " ".join(grouped_conditions)
             else:
-                final_conditions = " ".join(condition_stack)
+                current_or_group.append(term)
 
-            # Build the final logical expression
-            formatted_expression = f"({final_conditions}) implies {conclusion}"
-            logical_expressions.append(formatted_expression)
+        if current_or_group:
+            grouped_conditions.append(f"({' '.join(current_or_group)})")
+        final_conditions = " ".join(grouped_conditions)
+    else:
+        final_conditions = " ".join(condition_stack)
 
-    return logical_expressions
\ No newline at end of file
+    # Build the final logical expression
+    return f"({final_conditions}) implies {conclusion}"